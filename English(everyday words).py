@@ -9,25 +9,89 @@ Nach jeder Runde geht es zurück zum Anfang; Eingabe '0' beendet.
 Aufruf:
   python3 vokabeltrainer.py                # lädt Standard-URL
   python3 vokabeltrainer.py vokabeln.txt   # lädt lokale Datei
+  python3 vokabeltrainer.py --offline      # nur zwischengespeicherte Kopie der URL
+  python3 vokabeltrainer.py --fuzzy=2      # Tippfehler bis Editierabstand 2 zulassen
+  python3 vokabeltrainer.py tiere.txt 'themen/*.txt' URL   # mehrere Listen als ein Deck
+  python3 vokabeltrainer.py --merge=first a.txt b.txt        # bei Konflikten gilt die erste Liste
+  python3 vokabeltrainer.py --suche=ab     # Wörter mit Anfang 'ab' (beide Sprachen) zeigen
+  python3 vokabeltrainer.py --suche='*ab'  # Wörter, die 'ab' enthalten
+
+Mehrere Quellen (Dateien, URLs, Glob-Muster, Verzeichnisse) werden parallel
+geparst und zusammengeführt; jede Datei ist ein Thema, nach dem im Menü
+gefiltert werden kann. Konflikte (gleiches englisches Wort in mehreren Listen)
+regelt --merge=union|first|last, Standard union (siehe merge_vocabs).
+
+Im Menü schlägt 7=Nachschlagen Wörter nach (Anfang, sonst enthält), 8=Filter
+übt nur passende Wörter, z.B. 'ab' (beginnt mit) oder '*ab' (enthält); siehe SearchIndex.
+
+Downloads werden unter ~/.cache/vokabeltrainer (bzw. $XDG_CACHE_HOME) mit
+ETag/Last-Modified abgelegt und beim nächsten Start nur revalidiert.
+VOKABELN_OFFLINE=1 entspricht --offline, VOKABELN_FUZZY=N entspricht --fuzzy=N.
+--profile[=VERZEICHNIS] bzw. LERNTRAINER_PROFILE zeichnet Laden und Sitzung
+getrennt mit cProfile auf und speichert die Zähler (counters()) als JSON,
+siehe profiling.py.
 
 Kompatibel mit Python 3.8+ inkl. 3.14.
 """
 
 from __future__ import annotations
+import io
 import os
 import re
 import sys
-import ssl
+import ast
+import mmap
+import array
+import struct
+import time
+import heapq
+import bisect
 import random
-from typing import Dict, List, Tuple, Set
-from urllib.request import urlopen, Request
-from urllib.error import URLError
+import functools
+from collections import Counter
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Set, TextIO
+# ssl, urllib, gzip, hashlib & Co. werden erst beim Download importiert:
+# lokale Dateien und der Offline-Modus starten ohne Netzwerk-Module
+
+# Sitzung, Bewertung und Eingabe teilen sich beide Trainer (trainer_core.py daneben)
+import trainer_core
+from trainer_core import console_answer
+
+try:
+    from progress_store import ProgressStore
+except ImportError:
+    # Skript einzeln heruntergeladen: läuft ohne Lernverlauf
+    ProgressStore = None
+
+try:
+    from response_times import ResponseTimes
+except ImportError:
+    ResponseTimes = None
 
 DEFAULT_URL = "https://raw.githubusercontent.com/theguy16/python-lernprogramme/refs/heads/main/vokabeln.txt"
 
+# englisch -> (deutsch, ...); alle Strings internalisiert, Varianten ohne Dubletten
+Vocab = Dict[str, Tuple[str, ...]]
+
+def _norm_counters() -> Dict[str, int]:
+    # norm() zählt sein lru_cache ohnehin mit, das kostet nichts extra
+    info = norm.cache_info()
+    return {"norm_aufrufe": info.hits + info.misses, "norm_cache_treffer": info.hits}
+
+# Zähler und Profil für --profile (siehe trainer_core.Instrumentation)
+INSTR = trainer_core.Instrumentation("vokabeln", _norm_counters)
+_count = INSTR.count
+counters = INSTR.counters
+
 # ---------- Laden ----------
 
-def _urlopen_with_cert(url: str):
+_DOWNLOAD_FAILED = (
+    "Download fehlgeschlagen. Falls macOS: /Applications/Python 3.14/Install Certificates.command ausführen oder lokale Datei verwenden."
+)
+
+def _urlopen_with_cert(url: str, extra_headers: Optional[Dict[str, str]] = None):
+    import ssl
+    from urllib.request import urlopen, Request
     # Nutzt certifi, wenn verfügbar, sonst Standards.
     try:
         import certifi  # type: ignore
@@ -35,138 +99,1080 @@ def _urlopen_with_cert(url: str):
     except Exception:
         ctx = ssl.create_default_context()
     headers = {"User-Agent": "vokabeltrainer/1.0"}
+    headers.update(extra_headers or {})
     return urlopen(Request(url, headers=headers), context=ctx, timeout=20)
 
-def _read_text_from_src(src: str) -> str:
+def _download_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "vokabeltrainer")
+
+def fetch_cached(url: str, offline: bool = False) -> str:
+    """
+    Lädt `url` in den Download-Cache und gibt den Pfad der lokalen Kopie zurück.
+    Eine vorhandene Kopie wird per If-None-Match/If-Modified-Since revalidiert
+    (304 = unverändert, kein erneuter Download). Ist der Server nicht
+    erreichbar oder `offline` gesetzt, wird die vorhandene Kopie verwendet.
+    """
+    import json
+    import hashlib
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+    cache_dir = _download_cache_dir()
+    body_path = os.path.join(cache_dir, key + ".txt")
+    meta_path = os.path.join(cache_dir, key + ".json")
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        meta = {}
+    have = bool(meta) and os.path.exists(body_path)
+    if offline:
+        if not have:
+            raise RuntimeError(f"Offline-Modus: keine zwischengespeicherte Kopie von {url}")
+        return body_path
+
+    import gzip
+    import shutil
+    from urllib.error import HTTPError
+    headers = {"Accept-Encoding": "gzip"}
+    if have and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if have and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    try:
+        resp = _urlopen_with_cert(url, headers)
+    except HTTPError as e:
+        if e.code == 304 and have:
+            _count("download_unveraendert")
+            return body_path
+        if have:
+            print(f"Online-Quelle meldet HTTP {e.code}, zwischengespeicherte Kopie geladen.")
+            return body_path
+        raise RuntimeError(_DOWNLOAD_FAILED) from e
+    except Exception as e:
+        if have:
+            print("Online-Quelle nicht erreichbar, zwischengespeicherte Kopie geladen.")
+            return body_path
+        raise RuntimeError(_DOWNLOAD_FAILED) from e
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{body_path}.{os.getpid()}.tmp"
+    try:
+        with resp, open(tmp, "wb") as out:
+            body = resp
+            if resp.headers.get("Content-Encoding", "").lower() == "gzip":
+                body = gzip.GzipFile(fileobj=resp)
+            shutil.copyfileobj(body, out, 1 << 16)
+        os.replace(tmp, body_path)
+    except Exception as e:
+        try: os.remove(tmp)
+        except OSError: pass
+        if have:
+            print("Download abgebrochen, zwischengespeicherte Kopie geladen.")
+            return body_path
+        raise RuntimeError(_DOWNLOAD_FAILED) from e
+    meta = {
+        "url": url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    _count("download_neu")
+    return body_path
+
+def _open_src(src: str) -> TextIO:
+    """Öffnet URL oder Datei als Textstrom, damit zeilenweise gelesen werden kann."""
     if src.startswith(("http://", "https://")):
         try:
-            with _urlopen_with_cert(src) as f:
-                return f.read().decode("utf-8")
+            return io.TextIOWrapper(_urlopen_with_cert(src), encoding="utf-8")
         except Exception as e:
             # macOS-Standard-Python benötigt ggf. Zertifikate
-            raise RuntimeError(
-                "Download fehlgeschlagen. Falls macOS: /Applications/Python 3.14/Install Certificates.command ausführen oder lokale Datei verwenden."
-            ) from e
+            raise RuntimeError(_DOWNLOAD_FAILED) from e
     # Datei
     if not os.path.exists(src):
         raise FileNotFoundError(src)
-    with open(src, "r", encoding="utf-8") as f:
-        return f.read()
+    return open(src, "r", encoding="utf-8")
+
+# Ein Token pro Treffer: Kommentar, String-Literal, Satzzeichen oder Name.
+_TOKEN_RE = re.compile(
+    r"""\s*(?:(?P<comment>\#.*)"""
+    r"""|(?P<str>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')"""
+    r"""|(?P<punct>[{}\[\]():,=])"""
+    r"""|(?P<num>[-+]?(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][-+]?\d+)?[jJ]?)"""
+    r"""|(?P<name>[A-Za-z_]\w*))"""
+)
+
+def _tokens(lines: Iterable[str]) -> Iterator[Tuple[str, str, int]]:
+    """Zerlegt die Quelle zeilenweise in (art, wert, zeilennummer)."""
+    for lineno, line in enumerate(lines, 1):
+        pos, end = 0, len(line.rstrip())
+        while pos < end:
+            m = _TOKEN_RE.match(line, pos)
+            if m is None:
+                raise ValueError(f"Zeile {lineno}: unerwartetes Zeichen {line[pos:].strip()[:20]!r}")
+            pos = m.end()
+            kind = m.lastgroup
+            if kind == "comment" or kind is None:
+                continue
+            val = m.group(kind)
+            if kind == "str":
+                # Escapes nur bei Bedarf auswerten; literal_eval führt keinen Code aus
+                val = ast.literal_eval(val) if "\\" in val else val[1:-1]
+            yield kind, val, lineno
 
-def load_vocab(src: str) -> Dict[str, List[str]]:
+def iter_vocab(lines: Iterable[str]) -> Iterator[Tuple[str, List[str]]]:
     """
-    Erwartet Python-Quelltext, der eine Variable 'vokabeln' setzt.
-    Werte dürfen String oder Liste von Strings sein.
+    Liest 'vokabeln = {englisch: deutsch | [deutsch, ...], ...}' Zeile für Zeile
+    und liefert bereits bereinigte Paare (englisch, [deutsch, ...]).
+    Wie beim früheren exec() werden aufeinanderfolgende Strings verkettet
+    ("a" "b"), Werte, die keine Strings sind (Zahlen, None, True, False),
+    übersprungen, ebenso leere Werte und Einträge ohne Übersetzung oder mit
+    einem Schlüssel, der kein String ist.
     """
-    text = _read_text_from_src(src)
-    ns: Dict[str, object] = {}
-    exec(text, {}, ns)
-    if "vokabeln" not in ns or not isinstance(ns["vokabeln"], dict):
-        raise ValueError("Quelle enthält kein 'vokabeln'-Dict")
-    raw: dict = ns["vokabeln"]
+    toks = _tokens(lines)
+    pending: List[Tuple[str, str, int]] = []   # ein zurückgelegtes Token
 
-    # Normalisieren: nur {str: List[str]}
-    cleaned: Dict[str, List[str]] = {}
-    for en, de_vals in raw.items():
-        if not isinstance(en, str):
-            continue
-        if isinstance(de_vals, str):
-            vals = [de_vals]
-        elif isinstance(de_vals, (list, tuple)):
-            vals = [x for x in de_vals if isinstance(x, str)]
+    def take() -> Tuple[str, str, int]:
+        if pending:
+            return pending.pop()
+        for tok in toks:
+            return tok
+        raise ValueError("Quelle endet unerwartet")
+
+    def expect(*kinds_or_vals: str) -> Tuple[str, str, int]:
+        tok = take()
+        if tok[0] in kinds_or_vals or (tok[0] == "punct" and tok[1] in kinds_or_vals):
+            return tok
+        raise ValueError(f"Zeile {tok[2]}: erwartet {' oder '.join(kinds_or_vals)}, gefunden {tok[1]!r}")
+
+    def scalar(tok: Tuple[str, str, int]) -> Optional[str]:
+        """String ab tok (samt folgender Strings), None für andere Literale."""
+        kind, val, lineno = tok
+        if kind == "str":
+            parts = [val]
+            while True:
+                nxt = take()
+                if nxt[0] != "str":
+                    pending.append(nxt)
+                    return "".join(parts)
+                parts.append(nxt[1])
+        if kind == "num" or val in ("None", "True", "False"):
+            return None
+        raise ValueError(f"Zeile {lineno}: unbekannter Name {val!r}")
+
+    if expect("name")[1] != "vokabeln":
+        raise ValueError("Quelle enthält kein 'vokabeln'-Dict")
+    expect("=")
+    expect("{")
+    while True:
+        tok = expect("str", "num", "name", "}")
+        if tok[0] == "punct":
+            return
+        en = scalar(tok)
+        expect(":")
+        tok = expect("str", "num", "name", "[", "(")
+        if tok[0] != "punct":
+            vals = [scalar(tok)]
         else:
-            continue
-        vals = [v for v in (s.strip() for s in vals) if v]
-        if not vals:
-            continue
-        cleaned[en.strip()] = vals
-    if not cleaned:
+            close = "]" if tok[1] == "[" else ")"
+            vals = []
+            while True:
+                tok = expect("str", "num", "name", close)
+                if tok[0] == "punct":
+                    break
+                vals.append(scalar(tok))
+                if expect(",", close)[1] == close:
+                    break
+        vals = [v for v in (s.strip() for s in vals if s is not None) if v]
+        if en is not None and vals:
+            yield en.strip(), vals
+        if expect(",", "}")[1] == "}":
+            return
+
+# Satzzeichen-Reste am Ende einer Übersetzung ("unfall:", "milch,")
+_TRAILING_JUNK = re.compile(r"[\s:;,]+$")
+
+def canonicalize_vocab(pairs: Iterable[Tuple[str, List[str]]]) -> Tuple[Vocab, int]:
+    """
+    Ladeschritt nach dem Parser: entfernt Satzzeichen-Reste, wirft Varianten
+    mit gleicher Normalform weg ("mißbrauch" neben "missbrauch"; beim Abfragen
+    werden beide trotzdem akzeptiert), internalisiert alle Strings und speichert
+    die Übersetzungen als Tupel. Liefert (vokabeln, anzahl_entfernter_dubletten).
+    """
+    intern = sys.intern
+    vok: Vocab = {}
+    removed = 0
+    for en, vals in pairs:
+        seen: Set[str] = set()
+        keep: List[str] = []
+        for v in vals:
+            v = _TRAILING_JUNK.sub("", v)
+            key = _norm(v)
+            if not key or key in seen:
+                removed += 1
+                continue
+            seen.add(key)
+            keep.append(intern(v))
+        if keep:
+            vok[intern(en)] = tuple(keep)
+    return vok, removed
+
+def _load_canonical(src: str) -> Tuple[Vocab, int]:
+    with _open_src(src) as f:
+        vok, removed = canonicalize_vocab(iter_vocab(f))
+    if not vok:
         raise ValueError("Die Liste enthält keine nutzbaren Einträge")
-    return cleaned
+    return vok, removed
+
+def load_vocab(src: str) -> Vocab:
+    """
+    Erwartet eine Quelle im Format 'vokabeln = {...}' (Python-Dict-Literal).
+    Werte dürfen String oder Liste von Strings sein. Der Inhalt wird nur
+    geparst, nie ausgeführt.
+    """
+    return _load_canonical(src)[0]
 
 # ---------- Logik ----------
 
 _PUNCT_STRIP = str.maketrans({c: "" for c in "\"'`´‘’‚“”„"})
+_WS_RE = re.compile(r"\s+")
 
-def norm(s: str) -> str:
+def _norm(s: str) -> str:
     # Ignoriert Groß-/Kleinschreibung, führenden/trailing Leerraum und einfache Anführungszeichen
-    s = s.strip().casefold().translate(_PUNCT_STRIP)
-    s = re.sub(r"\s+", " ", s)
-    return s
+    return _WS_RE.sub(" ", s.strip().casefold().translate(_PUNCT_STRIP))
+
+@functools.lru_cache(maxsize=2048)
+def norm(s: str) -> str:
+    # Für Benutzereingaben: gleiche Antworten werden nur einmal normalisiert.
+    # Beim Laden wird _norm direkt benutzt, damit die Liste den Cache nicht flutet.
+    return _norm(s)
 
-def build_reverse(vok: Dict[str, List[str]]) -> Dict[str, Set[str]]:
+def norm_table(vok: Vocab) -> Dict[str, str]:
+    """
+    Normalform jedes Strings im Deck (englisch und deutsch), jede nur einmal
+    berechnet. build_reverse und build_answer_index schlagen darin nach,
+    statt dieselben Wörter mehrfach zu normalisieren.
+    """
+    strings = set(vok)
+    for de_list in vok.values():
+        strings.update(de_list)
+    intern = sys.intern
+    return {s: intern(_norm(s)) for s in strings}
+
+def build_reverse(vok: Vocab, norms: Optional[Dict[str, str]] = None) -> Dict[str, Set[str]]:
     """
     Mappe deutsch->Menge englischer Übersetzungen.
     Wenn ein deutsches Wort mehrfach vorkommt, werden alle EN-Varianten akzeptiert.
+    norms: optional norm_table(vok)
     """
+    n = norms.__getitem__ if norms is not None else (lambda s: sys.intern(_norm(s)))
     rev: Dict[str, Set[str]] = {}
     for en, de_list in vok.items():
         for de in de_list:
-            rev.setdefault(norm(de), set()).add(en)
+            rev.setdefault(n(de), set()).add(en)
     return rev
 
+class AnswerIndex(NamedTuple):
+    """
+    Vorab normalisierte Lösungsmengen, damit ask() pro Frage nur noch die
+    Eingabe normalisiert und einmal nachschlägt.
+      by_en: englisch -> {norm(deutsch), ...}
+      by_de: deutscher Prompt (wie in der Liste) -> {norm(englisch), ...}
+    """
+    by_en: Dict[str, FrozenSet[str]]
+    by_de: Dict[str, FrozenSet[str]]
+
+def build_answer_index(
+    vok: Vocab, rev: Dict[str, Set[str]], norms: Optional[Dict[str, str]] = None
+) -> AnswerIndex:
+    if norms is None:
+        norms = norm_table(vok)
+    n = norms.__getitem__
+    by_en = {en: frozenset(map(n, de_list)) for en, de_list in vok.items()}
+    # Prompts mit gleicher Normalform teilen sich dieselbe Menge
+    per_key = {key: frozenset(map(n, ens)) for key, ens in rev.items()}
+    by_de = {de: per_key[n(de)] for de_list in vok.values() for de in de_list}
+    return AnswerIndex(by_en, by_de)
+
+def _bit_pattern(pattern: str) -> Tuple[Dict[str, int], int]:
+    peq: Dict[str, int] = {}
+    for i, c in enumerate(pattern):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    return peq, len(pattern)
+
+def _myers(peq: Dict[str, int], m: int, text: str) -> int:
+    # Editierabstand bitparallel nach Myers/Hyyrö: eine DP-Spalte steckt in einem int
+    if m == 0:
+        return len(text)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for c in text:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return score
+
+def levenshtein(a: str, b: str) -> int:
+    """Editierabstand (Einfügen, Löschen, Ersetzen je 1)."""
+    return _myers(*_bit_pattern(b), a)
+
+def _bigrams(word: str) -> Set[str]:
+    padded = f"\0{word}\0"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+class GramIndex:
+    """
+    Wörter nach Länge sortiert, dazu pro Bigramm (mit Randzeichen) die
+    aufsteigenden Positionen der Wörter, die es enthalten. Jede Änderung
+    zerstört höchstens zwei Bigramme: ein Wort mit Abstand <= k teilt mit der
+    Anfrage also mindestens max(bigramme anfrage, bigramme wort) - 2k davon.
+    search() zählt die gemeinsamen Bigramme nur für Wörter passender Länge
+    (Counter über die Listen) und misst den Abstand nur, wo die Zahl reicht.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._words = sorted(set(words), key=lambda w: (len(w), w))
+        self._lens = array.array("I", map(len, self._words))
+        self._sizes = array.array("I")   # Anzahl verschiedener Bigramme pro Wort
+        postings: Dict[str, array.array] = {}
+        for i, w in enumerate(self._words):
+            grams = _bigrams(w)
+            self._sizes.append(len(grams))
+            for g in grams:
+                ids = postings.get(g)
+                if ids is None:
+                    ids = postings[g] = array.array("I")
+                ids.append(i)
+        self._postings = postings
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def search(self, word: str, max_dist: int) -> List[Tuple[int, str]]:
+        """Alle Wörter mit Abstand <= max_dist, nach Abstand sortiert."""
+        lens, m = self._lens, len(word)
+        lo = bisect.bisect_left(lens, m - max_dist)
+        hi = bisect.bisect_right(lens, m + max_dist)
+        grams = _bigrams(word)
+        slack = 2 * max_dist
+        shared: Counter = Counter()
+        for g in grams:
+            ids = self._postings.get(g)
+            if ids is not None:
+                shared.update(ids[bisect.bisect_left(ids, lo):bisect.bisect_left(ids, hi)])
+        need, sizes = len(grams) - slack, self._sizes
+        candidates = [i for i, c in shared.items() if c >= need and c >= sizes[i] - slack]
+        if need <= 0:
+            # kurze Anfrage: auch Wörter ohne gemeinsames Bigramm, wenn sie selbst kurz genug sind
+            candidates += [i for i in range(lo, hi) if sizes[i] <= slack and i not in shared]
+        peq, m = _bit_pattern(word)
+        words = self._words
+        hits: List[Tuple[int, str]] = []
+        for i in candidates:
+            d = _myers(peq, m, words[i])
+            if d <= max_dist:
+                hits.append((d, words[i]))
+        hits.sort()
+        return hits
+
+class FuzzyMatcher:
+    """
+    Tippfehlertolerante Bewertung über alle Normalformen aus build_reverse
+    (deutsche Schlüssel und englische Wörter).
+    Eine Eingabe gilt als richtig, wenn eine gültige Lösung höchstens
+    max_dist entfernt ist (bei kurzen Wörtern weniger: len // 4), die Eingabe
+    nicht selbst ein anderes Wort der Liste ist und kein anderes Wort näher liegt.
+    """
+
+    def __init__(self, rev: Dict[str, Set[str]], max_dist: int = 2):
+        self.max_dist = max_dist
+        forms = set(rev)
+        forms.update(_norm(en) for ens in rev.values() for en in ens)
+        self.words = frozenset(forms)
+        self.index = GramIndex(forms)
+
+    def match(self, user: str, valid: FrozenSet[str]) -> Optional[str]:
+        """Gültige Lösung, die mit `user` (normalisiert) gemeint war, sonst None."""
+        if user in self.words or not valid:
+            return None
+        # Gegen die wenigen gültigen Lösungen direkt messen; der Index wird nur
+        # gebraucht, um nähere fremde Wörter auszuschließen (Radius < bester Abstand).
+        peq, m = _bit_pattern(user)
+        d, word = min((_myers(peq, m, v), v) for v in valid)
+        if d > min(self.max_dist, len(word) // 4):
+            return None
+        if d > 1 and self.index.search(user, d - 1):
+            return None
+        return word
+
+    def suggest(self, user: str) -> Optional[str]:
+        """Nächstes Wort der Liste zu einer falschen Eingabe (außer ihr selbst)."""
+        for d, word in self.index.search(user, self.max_dist):
+            if d > 0:
+                return word
+        return None
+
+class _TermIndex:
+    """
+    Normalformen einer Sprache: sortiert (Präfix per bisect) und als
+    Trigramm -> Positionen in terms (Teilstrings). Zu jedem Term die Karten
+    im CSR-Format: flat[starts[i]:starts[i + 1]].
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[str, int]]):
+        by_term: Dict[str, List[int]] = {}
+        for term, card in pairs:
+            by_term.setdefault(term, []).append(card)
+        self.terms = sorted(by_term)
+        self.starts = array.array("I", [0])
+        self.flat = array.array("I")
+        grams: Dict[str, array.array] = {}
+        for i, term in enumerate(self.terms):
+            self.flat.extend(by_term[term])
+            self.starts.append(len(self.flat))
+            # Zwei Endmarken: jede Position beginnt ein Trigramm, auch die letzten beiden
+            padded = term + "\x03\x03"
+            for g in {padded[j:j + 3] for j in range(len(term))}:
+                arr = grams.get(g)
+                if arr is None:
+                    arr = grams[g] = array.array("I")
+                arr.append(i)   # i steigt, die Listen bleiben sortiert
+        self.grams = grams
+        self.gram_keys = sorted(grams)
+
+    def cards(self, i: int) -> array.array:
+        return self.flat[self.starts[i]:self.starts[i + 1]]
+
+    def prefix(self, q: str) -> range:
+        lo = bisect.bisect_left(self.terms, q)
+        return range(lo, bisect.bisect_left(self.terms, q + "\U0010ffff", lo))
+
+    def substring(self, q: str) -> List[int]:
+        terms = self.terms
+        if len(q) >= 3:
+            # Kandidaten aus dem seltensten Trigramm der Anfrage, dann prüfen
+            best = None
+            for j in range(len(q) - 2):
+                arr = self.grams.get(q[j:j + 3])
+                if arr is None:
+                    return []
+                if best is None or len(arr) < len(best):
+                    best = arr
+            return [i for i in best if q in terms[i]]
+        # Kurze Anfrage: Vereinigung aller Trigramme, die mit ihr beginnen
+        keys = self.gram_keys
+        lo = bisect.bisect_left(keys, q)
+        hits: Set[int] = set()
+        for k in range(lo, bisect.bisect_left(keys, q + "\U0010ffff", lo)):
+            hits.update(self.grams[keys[k]])
+        return sorted(hits)
+
+class SearchIndex:
+    """
+    Nachschlagen in beiden Sprachen, ohne alle Einträge durchzugehen:
+    Präfixsuche über sortierte Normalformen, Teilstringsuche über Trigramme.
+    Treffer sind Karten, also Positionen in keys (Reihenfolge von vok),
+    erst englische, dann deutsche Treffer, jeweils alphabetisch.
+    """
+
+    def __init__(self, vok: Vocab, norms: Optional[Dict[str, str]] = None):
+        if norms is None:
+            norms = norm_table(vok)
+        _count("suchindex_gebaut")
+        self.keys = list(vok)
+        self.en = _TermIndex((norms[en], i) for i, en in enumerate(self.keys))
+        self.de = _TermIndex((norms[de], i) for i, en in enumerate(self.keys) for de in vok[en])
+
+    def find(self, query: str, substring: bool = False, limit: Optional[int] = None) -> List[int]:
+        q = _norm(query)
+        if not q:
+            return []
+        _count("suchanfragen")
+        seen: Dict[int, None] = {}
+        for side in (self.en, self.de):
+            for i in (side.substring(q) if substring else side.prefix(q)):
+                for card in side.cards(i):
+                    seen[card] = None
+                if limit is not None and len(seen) >= limit:
+                    return list(seen)[:limit]
+        return list(seen)
+
+    def words(self, query: str, substring: bool = False, limit: Optional[int] = None) -> List[str]:
+        keys = self.keys
+        return [keys[c] for c in self.find(query, substring, limit)]
+
+def parse_query(text: str) -> Tuple[str, bool]:
+    """'ab' oder 'ab*' -> Wortanfang, '*ab' oder '*ab*' -> enthält; liefert (text, teilstring)."""
+    text = text.strip()
+    return text.strip("*"), text.startswith("*")
+
+# Deutsche Notenskala: (mindestprozent, note), ausgewertet von trainer_core.grade_for
+GRADE_THRESHOLDS = ((95, 1), (80, 2), (65, 3), (50, 4), (30, 5), (0, 6))
+
 def grade_from_percent(pct: float) -> int:
-    # Deutsche Notenskala
-    if pct >= 95: return 1
-    if pct >= 80: return 2
-    if pct >= 65: return 3
-    if pct >= 50: return 4
-    if pct >= 30: return 5
-    return 6
+    return trainer_core.grade_for(pct, GRADE_THRESHOLDS)
+
+class LeitnerScheduler:
+    """
+    Wiederholungsmodus nach Leitner auf einer logischen Uhr (gestellte Fragen).
+    Richtig -> nächster Kasten, falsch -> Kasten 0; Kasten k ist nach
+    INTERVALS[k] weiteren Fragen wieder fällig. Gesehene Karten liegen als
+    int-Schlüssel (fällig * n + karte) in einem Heap, neue Karten kommen in
+    zufälliger Reihenfolge dazu, solange gerade nichts fällig ist.
+    Karten sind Positionen in der Reihenfolge von vok.
+    """
+    INTERVALS = (3, 8, 20, 50, 130, 350)
+
+    def __init__(self, n_cards: int, rng: random.Random | None = None):
+        if n_cards <= 0:
+            raise ValueError("Keine Karten")
+        self.n = n_cards
+        self.clock = 0
+        self.box = array.array("b", [-1]) * n_cards   # -1 = noch nie gefragt
+        self._heap: List[int] = []
+        self._new = array.array("I", range(n_cards))
+        (rng or random).shuffle(self._new)
+
+    def next_card(self) -> int:
+        heap = self._heap
+        if heap and (heap[0] // self.n <= self.clock or not self._new):
+            return heapq.heappop(heap) % self.n
+        return self._new.pop()
+
+    def review(self, card: int, correct: bool) -> None:
+        self.clock += 1
+        box = min(max(self.box[card], 0) + 1, len(self.INTERVALS) - 1) if correct else 0
+        self.box[card] = box
+        heapq.heappush(self._heap, (self.clock + self.INTERVALS[box]) * self.n + card)
+
+class QuestionDeck:
+    """
+    Ziehen ohne Zurücklegen für die Modi 1-3: eine gemischte Permutation der
+    Karten (array "I"), durch die ein Zeiger läuft. Erst wenn jede Karte einmal
+    dran war, beginnt ein neuer, neu gemischter Durchgang. Die Permutation
+    ergibt sich aus (seed, durchgang), daher reichen zum Fortsetzen in einem
+    späteren Lauf fünf Zahlen (state/restore). Karten sind Positionen in keys.
+
+    Richtungen im gemischten Modus kommen paarweise: je zwei Fragen eine
+    EN->DE und eine DE->EN in zufälliger Reihenfolge, also exakt ausgeglichen.
+    """
+
+    def __init__(self, keys: Iterable[str], seed: Optional[int] = None, rng: random.Random | None = None):
+        self.keys = list(keys)
+        if not self.keys:
+            raise ValueError("Keine Karten")
+        self.seed = (rng or random).getrandbits(32) if seed is None else seed
+        self.passes = 0
+        self.pos = 0
+        self._order: Optional[array.array] = None   # erst beim ersten Ziehen gemischt
+        self._rng = rng or random
+        self._next_dir = 0
+
+    def _permutation(self, passes: int) -> array.array:
+        order = array.array("I", range(len(self.keys)))
+        random.Random(self.seed * 1_000_003 + passes).shuffle(order)
+        return order
+
+    def _shuffle(self, last: Optional[int] = None) -> None:
+        """Mischt den Durchgang self.passes; last = letzte Karte des vorigen."""
+        order = self._permutation(self.passes)
+        n = len(order)
+        if self.passes and n > 1:
+            if last is None:
+                # beim Fortsetzen: der Tausch unten lässt die letzte Karte stehen
+                # (bei zwei Karten sieht jeder Durchgang aus wie der erste)
+                last = self._permutation(self.passes - 1 if n > 2 else 0)[-1]
+            if order[0] == last:
+                # keine Wiederholung direkt an der Grenze zweier Durchgänge
+                order[0], order[1] = order[1], order[0]
+        self._order = order
+
+    def next_card(self) -> int:
+        if self._order is None:
+            self._shuffle()
+        elif self.pos >= len(self._order):
+            last = self._order[-1]
+            self.passes += 1
+            self.pos = 0
+            self._shuffle(last)
+        card = self._order[self.pos]
+        self.pos += 1
+        return card
+
+    def next_direction(self) -> int:
+        """1 = EN->DE, 2 = DE->EN; über je zwei Aufrufe genau einmal jede Richtung."""
+        d = self._next_dir
+        if d:
+            self._next_dir = 0
+            return d
+        d = 1 if self._rng.random() < 0.5 else 2
+        self._next_dir = 3 - d
+        return d
+
+    def variant(self, card: int, k: int) -> int:
+        """Welche von k Übersetzungen als deutscher Prompt dient; wechselt pro Durchgang."""
+        return (card + self.passes) % k
+
+    def fingerprint(self) -> int:
+        import zlib
+        return zlib.crc32("\n".join(self.keys).encode("utf-8"))
+
+    def state(self) -> str:
+        return f"{len(self.keys)} {self.fingerprint()} {self.seed} {self.passes} {self.pos}"
+
+    @classmethod
+    def restore(cls, keys: Iterable[str], state: Optional[str], rng: random.Random | None = None) -> "QuestionDeck":
+        """Setzt einen gespeicherten Stand fort, wenn er zur selben Liste gehört, sonst neu."""
+        deck = cls(keys, rng=rng)
+        try:
+            n, fp, seed, passes, pos = (int(x) for x in (state or "").split())
+        except ValueError:
+            return deck
+        if n != len(deck.keys) or fp != deck.fingerprint() or not 0 <= pos <= n:
+            return deck
+        deck.seed, deck.passes = seed, passes
+        deck._shuffle()
+        deck.pos = pos
+        return deck
+
+class VocabTasks:
+    """
+    Aufgabentyp "vokabeln" (Plugin für trainer_core), die Fragen von ask():
+    Reihenfolge aus deck (Modi 1-3) bzw. scheduler (Modus 4); ohne deck
+    zufällig mit Zurücklegen aus keys, wie im Quiz-Server, wo sich viele
+    Sitzungen eine Liste teilen.
+    Aufgaben: (prompt, eine lösung, englisch, richtung,
+    (gültige normalformen, karte, deutscher prompt oder None)); alle
+    Lösungen als Text baut erst solution(), also nur bei falschen Antworten.
+    """
+    name = "vokabeln"
+    label = "Wörter"
+    thresholds = GRADE_THRESHOLDS
+    timer_key = "card"
+
+    def __init__(
+        self,
+        vok: Vocab,
+        rev: Dict[str, Set[str]],
+        answers: Optional[AnswerIndex] = None,
+        mode: int = 3,
+        deck: Optional[QuestionDeck] = None,
+        scheduler: Optional[LeitnerScheduler] = None,
+        fuzzy: Optional[FuzzyMatcher] = None,
+        keys: Optional[List[str]] = None,
+        rng: random.Random | None = None,
+    ):
+        if mode == 4 and scheduler is None:
+            scheduler = LeitnerScheduler(len(vok))
+        self.vok, self.rev, self.mode = vok, rev, mode
+        self.answers = answers if answers is not None else build_answer_index(vok, rev)
+        self.deck, self.scheduler, self.fuzzy = deck, scheduler, fuzzy
+        self.keys = deck.keys if deck is not None else (keys if keys is not None else list(vok))
+        self._rng = rng or random
+
+    def next_task(self) -> Tuple[str, str, str, str, Tuple[FrozenSet[str], int, Optional[str]]]:
+        mode, deck = self.mode, self.deck
+        if mode == 4:
+            card = self.scheduler.next_card()
+        else:
+            card = deck.next_card() if deck is not None else self._rng.randrange(len(self.keys))
+        en = self.keys[card]
+        de_list = self.vok[en]
+        if mode in (1, 2):
+            direction = mode
+        else:
+            direction = deck.next_direction() if deck is not None else self._rng.choice((1, 2))
+        if direction == 1:
+            return f"{en}  -> deutsch: ", de_list[0], en, "en-de", (self.answers.by_en[en], card, None)
+        k = len(de_list)
+        de = de_list[deck.variant(card, k) if deck is not None else self._rng.randrange(k)]
+        return f"{de}  -> englisch: ", en, en, "de-en", (self.answers.by_de[de], card, de)
+
+    def solution(self, task: Tuple) -> str:
+        en, de = task[2], task[4][2]
+        if de is None:
+            return ", ".join(self.vok[en])
+        return ", ".join(sorted(self.rev.get(_norm(de), {en})))
+
+    def grade(self, task: Tuple, user: str) -> Tuple[bool, float, float, str]:
+        valid = task[4][0]
+        if user.strip():
+            u = norm(user)
+            if u in valid:
+                return True, 1.0, 1.0, "richtig"
+            fuzzy = self.fuzzy
+            if fuzzy is not None:
+                hit = fuzzy.match(u, valid)
+                if hit is not None:
+                    return True, 1.0, 1.0, f"richtig (Tippfehler, gemeint: {hit})"
+                similar = fuzzy.suggest(u)
+                if similar is not None:
+                    return False, 0.0, 1.0, f"falsch | richtig: {self.solution(task)} | ähnlich: {similar}"
+        return False, 0.0, 1.0, f"falsch | richtig: {self.solution(task)}"
+
+    def review(self, task: Tuple, ok: bool, seconds: float) -> None:
+        if self.mode == 4:
+            self.scheduler.review(task[4][1], ok)
 
 def ask(
-    vok: Dict[str, List[str]],
+    vok: Vocab,
     rev: Dict[str, Set[str]],
     mode: int,
     n_questions: int,
+    answers: Optional[AnswerIndex] = None,
+    scheduler: Optional[LeitnerScheduler] = None,
+    store: Optional["ProgressStore"] = None,
+    fuzzy: Optional[FuzzyMatcher] = None,
+    read_answer: Callable[[str, str], str] = console_answer,
+    timer: Optional["ResponseTimes"] = None,
+    deck: Optional[QuestionDeck] = None,
 ) -> Tuple[int, int]:
     """
-    mode: 1 EN->DE, 2 DE->EN, 3 gemischt
-    n_questions: Anzahl Fragen, mit Zurücklegen wenn größer als Items
-    """
-    en_items = list(vok.items())
-    total = 0
-    correct = 0
-
-    def q_en_to_de(en: str, de_list: List[str]) -> bool:
-        user = input(f"{en}  -> deutsch: ")
-        if not user.strip():
-            print(f"falsch | richtig: {', '.join(de_list)}")
-            return False
-        if norm(user) in {norm(x) for x in de_list}:
-            print("richtig")
-            return True
-        print(f"falsch | richtig: {', '.join(de_list)}")
-        return False
-
-    def q_de_to_en(en: str, de_list: List[str]) -> bool:
-        de = random.choice(de_list)
-        user = input(f"{de}  -> englisch: ")
-        if not user.strip():
-            valid = sorted(rev.get(norm(de), {en}))
-            print(f"falsch | richtig: {', '.join(valid)}")
-            return False
-        if norm(user) in {norm(x) for x in rev.get(norm(de), {en})}:
-            print("richtig")
-            return True
-        valid = sorted(rev.get(norm(de), {en}))
-        print(f"falsch | richtig: {', '.join(valid)}")
-        return False
-
-    for _ in range(n_questions):
-        en, de_list = random.choice(en_items)
-        direction = (
-            1 if mode == 1 else
-            2 if mode == 2 else
-            (1 if random.random() < 0.5 else 2)
-        )
-        total += 1
-        ok = q_en_to_de(en, de_list) if direction == 1 else q_de_to_en(en, de_list)
-        if ok:
-            correct += 1
+    mode: 1 EN->DE, 2 DE->EN, 3 gemischt, 4 Wiederholung (gemischt, per scheduler)
+    n_questions: Anzahl Fragen; erst nach allen Items wiederholt sich etwas
+    answers: vorab berechneter Lösungsindex; fehlt er, wird er hier gebaut
+    scheduler: bestimmt in Modus 4 die Reihenfolge und merkt sich die Ergebnisse
+    store: Lernverlauf; jede Antwort wird gepuffert mitgeschrieben
+    fuzzy: wenn gesetzt, werden Tippfehler akzeptiert und Ähnliches vorgeschlagen
+    read_answer: (prompt, eine richtige Lösung) -> Eingabe; Standard ist input()
+    timer: sammelt die Antwortzeit jeder Frage (Schlüssel: englisches Wort)
+    deck: Reihenfolge ohne Wiederholung und Richtungsausgleich; über Runden
+          weitergereicht, läuft es durch die ganze Liste, bevor sich etwas wiederholt
+    """
+    if mode == 4 and scheduler is None:
+        scheduler = LeitnerScheduler(len(vok))
+    if deck is None:
+        deck = QuestionDeck(vok)
+    tasks = VocabTasks(vok, rev, answers, mode, deck, scheduler, fuzzy)
+    session = trainer_core.Session(tasks, n_questions, store=store, timer=timer)
+    while True:
+        prompt = session.next_question()
+        if prompt is None:
+            break
+        t0 = time.perf_counter()   # Antwortzeit: nur die Eingabe selbst
+        user = read_answer(prompt, session.task[1])
+        print(session.answer(user, time.perf_counter() - t0)[1])
 
+    correct, total = session.score.correct, session.score.total
+    _count("fragen", total)
+    _count("runden")
     return correct, total
 
+# ---------- Cache ----------
+#
+# Kompilierte Fassung der Liste neben der Quelldatei ("<quelle>.cache"):
+#   Kopf     magic, version, größe + mtime_ns der Quelle, byteorder, längen,
+#            anzahl beim Laden entfernter Dubletten
+#   strings  alle Wörter und Normalformen einmalig, UTF-8, durch \0 getrennt
+#   arrays   uint32-Arrays in nativer Bytereihenfolge, je mit Längenpräfix:
+#     vorwärts   en_ids, start, de_ids          englisch -> [deutsch, ...]
+#                start, norm_ids                englisch -> {norm(deutsch), ...}
+#     rückwärts  key_ids, start, en_ids         norm(deutsch) -> {englisch, ...}
+#                start, norm_ids                norm(deutsch) -> {norm(englisch), ...}
+#     prompts    de_ids, key_pos                deutscher Prompt -> Index in key_ids
+# Stimmt Größe oder mtime der Quelle nicht mehr, wird neu geparst und der
+# Cache überschrieben.
+
+_CACHE_MAGIC = b"VOKC"
+_CACHE_VERSION = 4
+_CACHE_HEADER = struct.Struct("=4sB?xxQQIIII")
+_CACHE_N_ARRAYS = 15
+
+class Loaded(NamedTuple):
+    vok: Vocab
+    rev: Dict[str, Set[str]]
+    answers: AnswerIndex
+    removed: int = 0   # beim Laden entfernte Dubletten
+    topics: Dict[str, Tuple[str, ...]] = {}   # thema -> englische Wörter, nur bei mehreren Quellen
+
+class _Stamp(NamedTuple):
+    # Was der Cache-Kopf von os.stat_result braucht; für Decks aus mehreren Dateien
+    st_size: int
+    st_mtime_ns: int
+
+def _cache_path(src: str) -> str:
+    return src + ".cache"
+
+def _write_cache(path: str, st: "os.stat_result | _Stamp", loaded: Loaded) -> None:
+    vok, rev, answers, removed, topics = loaded
+    ids: Dict[str, int] = {}
+
+    def sid(s: str) -> int:
+        i = ids.get(s)
+        if i is None:
+            i = ids[s] = len(ids)
+        return i
+
+    def csr(groups: Iterable[Iterable[str]]) -> Tuple[array.array, array.array]:
+        starts, vals = array.array("I", [0]), array.array("I")
+        for members in groups:
+            vals.extend(sid(m) for m in members)
+            starts.append(len(vals))
+        return starts, vals
+
+    rev_keys = list(rev)
+    key_pos = {k: i for i, k in enumerate(rev_keys)}
+    prompts = list(answers.by_de)
+    arrays = [
+        array.array("I", (sid(en) for en in vok)), *csr(vok.values()),
+        *csr(answers.by_en[en] for en in vok),
+        array.array("I", (sid(k) for k in rev_keys)), *csr(sorted(rev[k]) for k in rev_keys),
+        *csr({_norm(en) for en in rev[k]} for k in rev_keys),
+        array.array("I", (sid(de) for de in prompts)),
+        array.array("I", (key_pos[_norm(de)] for de in prompts)),
+        array.array("I", (sid(t) for t in topics)), *csr(topics.values()),
+    ]
+    blob = "\0".join(ids).encode("utf-8")
+    blob += b"\0" * (-len(blob) % 4)  # Arrays danach 4-Byte-ausgerichtet
+    header = _CACHE_HEADER.pack(
+        _CACHE_MAGIC, _CACHE_VERSION, sys.byteorder == "little",
+        st.st_size, st.st_mtime_ns, len(ids), len(blob), len(arrays), removed,
+    )
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(blob)
+            for arr in arrays:
+                f.write(struct.pack("=I", len(arr)))
+                arr.tofile(f)
+        os.replace(tmp, path)
+    except OSError:
+        # Schreibgeschütztes Verzeichnis o.ä.: dann eben ohne Cache
+        try: os.remove(tmp)
+        except OSError: pass
+
+def _read_cache(path: str, st: "os.stat_result | _Stamp") -> Optional[Loaded]:
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None
+    with f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) < _CACHE_HEADER.size:
+            return None
+        (magic, version, little, size, mtime_ns,
+         n_str, blob_len, n_arrays, removed) = _CACHE_HEADER.unpack_from(mm)
+        if (magic, version, little, size, mtime_ns, n_arrays) != (
+            _CACHE_MAGIC, _CACHE_VERSION, sys.byteorder == "little",
+            st.st_size, st.st_mtime_ns, _CACHE_N_ARRAYS,
+        ):
+            return None
+        pos = _CACHE_HEADER.size
+        strings = str(mm[pos:pos + blob_len], "utf-8").split("\0")
+        pos += blob_len
+        arrays = []
+        for _ in range(n_arrays):
+            (n,) = struct.unpack_from("=I", mm, pos)
+            arr = array.array("I")
+            arr.frombytes(mm[pos + 4:pos + 4 + 4 * n])
+            arrays.append(arr)
+            pos += 4 + 4 * n
+        if pos != len(mm) or len(strings) < n_str:
+            return None
+    (en_ids, de_start, de_ids, en_norm_start, en_norm_ids,
+     key_ids, rev_start, rev_ids, key_norm_start, key_norm_ids,
+     prompt_ids, prompt_key, topic_ids, topic_start, topic_vals) = arrays
+
+    def group(start: array.array, vals: array.array, j: int) -> Tuple[str, ...]:
+        return tuple([strings[i] for i in vals[start[j]:start[j + 1]]])
+
+    # Jeder String existiert nur einmal in `strings`; alle Strukturen teilen ihn
+    en_keys = [strings[k] for k in en_ids]
+    vok = {en: group(de_start, de_ids, j) for j, en in enumerate(en_keys)}
+    by_en = {en: frozenset(group(en_norm_start, en_norm_ids, j)) for j, en in enumerate(en_keys)}
+    rev_keys = [strings[k] for k in key_ids]
+    rev = {key: set(group(rev_start, rev_ids, j)) for j, key in enumerate(rev_keys)}
+    per_key = [frozenset(group(key_norm_start, key_norm_ids, j)) for j in range(len(rev_keys))]
+    by_de = {strings[i]: per_key[k] for i, k in zip(prompt_ids, prompt_key)}
+    topics = {strings[t]: group(topic_start, topic_vals, j) for j, t in enumerate(topic_ids)}
+    return Loaded(vok, rev, AnswerIndex(by_en, by_de), removed, topics)
+
+def _build(src: str) -> Loaded:
+    vok, removed = _load_canonical(src)
+    norms = norm_table(vok)
+    _count("normalisiert_beim_laden", len(norms))
+    rev = build_reverse(vok, norms)
+    return Loaded(vok, rev, build_answer_index(vok, rev, norms), removed)
+
+def load_vocab_cached(src: str, offline: bool = False) -> Loaded:
+    """
+    Wie load_vocab + build_reverse + build_answer_index, nutzt aber den
+    kompilierten Cache, solange die Quelle unverändert ist. URLs gehen über
+    den Download-Cache (fetch_cached).
+    """
+    if src.startswith(("http://", "https://")):
+        src = fetch_cached(src, offline=offline)
+    if not os.path.exists(src):
+        return _build(src)
+    st = os.stat(src)
+    path = _cache_path(src)
+    try:
+        cached = _read_cache(path, st)
+    except (ValueError, OSError, struct.error):
+        cached = None
+    if cached is not None:
+        _count("kompilierter_cache_treffer")
+        return cached
+    _count("kompilierter_cache_neu")
+    loaded = _build(src)
+    _write_cache(path, st, loaded)
+    return loaded
+
+# ---------- Mehrere Quellen ----------
+
+MERGE_POLICIES = ("union", "first", "last")
+
+def expand_sources(specs: Iterable[str]) -> List[str]:
+    """
+    URLs bleiben unverändert, Verzeichnisse liefern ihre *.txt-Dateien, Muster
+    mit * ? [ werden per glob aufgelöst (sortiert, ** rekursiv). Doppelte
+    Angaben zählen einmal, die Reihenfolge bleibt erhalten.
+    """
+    import glob
+    out: List[str] = []
+    for spec in specs:
+        if spec.startswith(("http://", "https://")):
+            found = [spec]
+        elif os.path.isdir(spec):
+            found = sorted(glob.glob(os.path.join(spec, "*.txt")))
+        elif any(c in spec for c in "*?["):
+            found = sorted(p for p in glob.glob(spec, recursive=True) if os.path.isfile(p))
+        else:
+            found = [spec]
+        if not found:
+            raise FileNotFoundError(f"Keine Vokabellisten für {spec!r}")
+        out.extend(found)
+    return list(dict.fromkeys(out))
+
+def topic_name(src: str) -> str:
+    """Thema einer Quelle: Dateiname ohne Endung ("themen/tiere.txt" -> "tiere")."""
+    base = src.rstrip("/").rsplit("/", 1)[-1] if "://" in src else os.path.basename(src)
+    return os.path.splitext(base)[0] or base
+
+def merge_vocabs(
+    shards: Iterable[Tuple[str, Vocab]], policy: str = "union"
+) -> Tuple[Vocab, int, Dict[str, Tuple[str, ...]]]:
+    """
+    Führt (thema, vokabeln)-Paare in der gegebenen Reihenfolge zu einem Deck
+    zusammen. Steht ein englisches Wort in mehreren Listen, gilt `policy`:
+      union  Übersetzungen aller Listen in Listenreihenfolge, Varianten mit
+             gleicher Normalform nur einmal (Standard)
+      first  nur die Übersetzungen der ersten Liste
+      last   nur die Übersetzungen der letzten Liste
+    Das Wort gehört in jedem Fall zu allen Themen, in denen es vorkommt.
+    Liefert (vokabeln, entfernte_dubletten, {thema: (englisch, ...)}).
+    """
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f"Unbekannte Regel {policy!r}, erlaubt: {', '.join(MERGE_POLICIES)}")
+    intern = sys.intern
+    vok: Vocab = {}
+    removed = 0
+    topics: Dict[str, List[str]] = {}
+    for topic, part in shards:
+        members = topics.setdefault(intern(topic), [])
+        for en, vals in part.items():
+            # Aus Worker-Prozessen kommen die Strings nicht internalisiert an
+            en = intern(en)
+            members.append(en)
+            have = vok.get(en)
+            if have is None or policy == "last":
+                vok[en] = tuple([intern(v) for v in vals])
+            elif policy == "union":
+                seen = {_norm(v) for v in have}
+                extra = tuple([intern(v) for v in vals if _norm(v) not in seen])
+                removed += len(vals) - len(extra)
+                if extra:
+                    vok[en] = have + extra
+    return vok, removed, {t: tuple(dict.fromkeys(m)) for t, m in topics.items()}
+
+def _parse_shard(src: str) -> Tuple[Vocab, int, Dict[str, str]]:
+    # Modulebene, damit ProcessPoolExecutor die Funktion an Worker schicken kann.
+    # Die Normalformen entstehen hier mit, also ebenfalls parallel.
+    vok, removed = _load_canonical(src)
+    return vok, removed, norm_table(vok)
+
+def _deck_cache(paths: List[str], stats: List[os.stat_result], policy: str) -> Tuple[str, _Stamp]:
+    import hashlib
+    ident = "\n".join([policy] + [os.path.abspath(p) for p in paths]).encode("utf-8")
+    key = hashlib.sha1(ident).hexdigest()[:16]
+    # Größe und mtime aller Dateien in 64 Bit, passt ins mtime-Feld des Cache-Kopfs
+    fp = hashlib.sha1(repr([(st.st_size, st.st_mtime_ns) for st in stats]).encode("ascii")).digest()
+    stamp = _Stamp(sum(st.st_size for st in stats), int.from_bytes(fp[:8], "little"))
+    return os.path.join(_download_cache_dir(), f"deck-{key}.cache"), stamp
+
+def load_vocab_multi(
+    sources: List[str], offline: bool = False, policy: str = "union",
+    processes: Optional[bool] = None,
+) -> Loaded:
+    """
+    Lädt mehrere Quellen (siehe expand_sources) als ein Deck mit Themen.
+    URLs kommen parallel über den Download-Cache, die Dateien werden parallel
+    geparst und mit merge_vocabs zusammengeführt; Umkehrindex und Lösungsindex
+    entstehen einmal für das ganze Deck. Das Ergebnis wird wie bei
+    load_vocab_cached kompiliert zwischengespeichert, solange sich keine
+    Quelle ändert. processes: Worker-Prozesse statt Threads; Standard ist
+    ja, wenn das Skript direkt läuft oder Prozesse per fork starten.
+    """
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+    names = [topic_name(src) for src in sources]
+    urls = [src for src in sources if src.startswith(("http://", "https://"))]
+    fetched: Dict[str, str] = {}
+    if urls:
+        with ThreadPoolExecutor(max_workers=min(8, len(urls))) as ex:
+            fetched = dict(zip(urls, ex.map(lambda u: fetch_cached(u, offline=offline), urls)))
+    paths = [fetched.get(src, src) for src in sources]
+    stats = [os.stat(p) for p in paths]
+    cache, stamp = _deck_cache(paths, stats, policy)
+    try:
+        cached = _read_cache(cache, stamp)
+    except (ValueError, OSError, struct.error):
+        cached = None
+    if cached is not None:
+        _count("kompilierter_cache_treffer")
+        return cached
+    _count("kompilierter_cache_neu")
+    _count("listen_geparst", len(paths))
+
+    workers = min(len(paths), os.cpu_count() or 1)
+    if workers <= 1:
+        parts = [_parse_shard(p) for p in paths]
+    else:
+        if processes is None:
+            import multiprocessing
+            # Worker finden _parse_shard über den Modulnamen: klappt als Skript (__main__)
+            # und bei fork, wenn das Modul unter seinem Namen in sys.modules steht
+            # (headless.py lädt es so); sonst, z.B. bei spawn nach Import, Threads
+            registered = getattr(sys.modules.get(__name__), "_parse_shard", None) is _parse_shard
+            processes = __name__ == "__main__" or (registered and multiprocessing.get_start_method() == "fork")
+        pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with pool(max_workers=workers) as ex:
+            parts = list(ex.map(_parse_shard, paths))
+    vok, removed, topics = merge_vocabs(zip(names, (v for v, _, _ in parts)), policy)
+    removed += sum(r for _, r, _ in parts)
+    norms: Dict[str, str] = {}
+    for _, _, part_norms in parts:
+        norms.update(part_norms)
+    _count("normalisiert_beim_laden", len(norms))
+    rev = build_reverse(vok, norms)
+    loaded = Loaded(vok, rev, build_answer_index(vok, rev, norms), removed, topics)
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+    except OSError:
+        return loaded
+    _write_cache(cache, stamp, loaded)
+    return loaded
+
 # ---------- UI ----------
 
 def read_int(prompt: str, default: int, valid: Set[int] | None = None) -> int:
@@ -181,44 +1187,227 @@ def read_int(prompt: str, default: int, valid: Set[int] | None = None) -> int:
         return default
     return max(0, v)
 
+def _fuzzy_dist(value: str, source: str) -> int:
+    """Editierabstand aus --fuzzy=N bzw. VOKABELN_FUZZY; beendet bei ungültigem Wert."""
+    try:
+        dist = int(value)
+    except ValueError:
+        dist = -1
+    if dist < 0:
+        sys.exit(f"Ungültiger Wert für {source}: {value!r} (erwartet eine ganze Zahl ab 0)")
+    return dist
+
 def main():
-    src = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_URL
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    flags = [a for a in sys.argv[1:] if a.startswith("--")]
+    offline = "--offline" in flags or os.environ.get("VOKABELN_OFFLINE") == "1"
+    fuzzy_dist = _fuzzy_dist(os.environ.get("VOKABELN_FUZZY") or "0", "VOKABELN_FUZZY")
+    policy = "union"
+    query = None
+    for flag in flags:
+        if flag == "--fuzzy":
+            fuzzy_dist = 2
+        elif flag.startswith("--fuzzy="):
+            fuzzy_dist = _fuzzy_dist(flag.split("=", 1)[1], "--fuzzy")
+        elif flag.startswith("--merge="):
+            policy = flag.split("=", 1)[1]
+        elif flag.startswith("--suche="):
+            query = flag.split("=", 1)[1]
+    INSTR.start(trainer_core.profile_setting(flags))
     try:
-        vok = load_vocab(src)
-    except Exception as e:
-        # Fallback: lokale "vokabeln.txt", wenn vorhanden
-        local = "vokabeln.txt"
-        if src.startswith(("http://", "https://")) and os.path.exists(local):
-            try:
-                vok = load_vocab(local)
-                print("Online-Quelle fehlgeschlagen, lokale Datei geladen.")
-            except Exception:
+        run(expand_sources(args) if args else [DEFAULT_URL], offline, policy, fuzzy_dist, query)
+    finally:
+        INSTR.stop()
+
+def run(sources: List[str], offline: bool, policy: str, fuzzy_dist: int,
+        query: Optional[str] = None) -> None:
+    if len(sources) > 1:
+        loaded = load_vocab_multi(sources, offline=offline, policy=policy)
+    else:
+        src = sources[0]
+        try:
+            loaded = load_vocab_cached(src, offline=offline)
+        except Exception as e:
+            # Fallback: lokale "vokabeln.txt", wenn vorhanden
+            local = "vokabeln.txt"
+            if src.startswith(("http://", "https://")) and os.path.exists(local):
+                try:
+                    loaded = load_vocab_cached(local)
+                    print("Online-Quelle fehlgeschlagen, lokale Datei geladen.")
+                except Exception:
+                    raise
+            else:
                 raise
-        else:
-            raise
+    vok, rev, answers = loaded.vok, loaded.rev, loaded.answers
+
+    if query is not None:
+        INSTR.phase("sitzung")
+        lookup(SearchIndex(vok), vok, query)
+        return
+
+    print(f"{len(vok)} Einträge geladen.")
+    if loaded.topics:
+        print(f"{len(loaded.topics)} Themen: {', '.join(loaded.topics)}")
+    if loaded.removed:
+        print(f"{loaded.removed} doppelte Varianten entfernt.")
+    print()
+
+    store = None
+    if ProgressStore is not None:
+        try:
+            store = ProgressStore()
+        except Exception:
+            print("Lernverlauf nicht verfügbar, es wird nichts gespeichert.")
+    fuzzy = FuzzyMatcher(rev, fuzzy_dist) if fuzzy_dist > 0 else None
+    INSTR.phase("sitzung")
+    try:
+        menu_loop(vok, rev, answers, store, fuzzy, loaded.topics)
+    finally:
+        if store is not None:
+            store.close()
 
-    rev = build_reverse(vok)
-    print(f"{len(vok)} Einträge geladen.\n")
+def print_stats(store: Optional["ProgressStore"]) -> None:
+    if store is None:
+        print("Kein Lernverlauf vorhanden.\n")
+        return
+    weakest = store.weakest("vokabeln")
+    if weakest:
+        print("\nSchwächste Wörter:")
+        for card, ok, n in weakest:
+            print(f"  {card}: {ok}/{n} richtig")
+    days = store.daily_accuracy("vokabeln")
+    if days:
+        print("\nTrefferquote pro Tag:")
+        for day, ok, n in days:
+            print(f"  {day}: {ok}/{n} ({ok / n * 100:.0f} %)")
+    if not weakest and not days:
+        print("Noch keine Antworten gespeichert.")
+    print()
+
+def choose_topic(topics: Dict[str, Tuple[str, ...]]) -> Optional[str]:
+    names = list(topics)
+    print("Themen: 0=alle, " + ", ".join(f"{i}={name} ({len(topics[name])})" for i, name in enumerate(names, 1)))
+    k = read_int("Thema wählen (leer=alle): ", default=0, valid=set(range(len(names) + 1)))
+    return names[k - 1] if k else None
+
+LOOKUP_LIMIT = 20
+
+def lookup(index: SearchIndex, vok: Vocab, query: str, limit: int = LOOKUP_LIMIT) -> List[str]:
+    """Zeigt Treffer zu `query`: erst Wortanfänge, bis `limit` aufgefüllt mit Teilstrings."""
+    q, substring = parse_query(query)
+    hits = index.words(q, substring, limit + 1)
+    if not substring and len(hits) <= limit:
+        seen = set(hits)
+        hits += [en for en in index.words(q, True, limit + 1) if en not in seen]
+    if not hits:
+        print("Keine Treffer.\n")
+        return []
+    for en in hits[:limit]:
+        print(f"  {en}: {', '.join(vok[en])}")
+    print(f"mehr als {limit} Treffer, Suche verfeinern.\n" if len(hits) > limit else "")
+    return hits[:limit]
+
+def menu_loop(
+    vok: Vocab,
+    rev: Dict[str, Set[str]],
+    answers: AnswerIndex,
+    store: Optional["ProgressStore"] = None,
+    fuzzy: Optional[FuzzyMatcher] = None,
+    topics: Optional[Dict[str, Tuple[str, ...]]] = None,
+) -> None:
+    # Bleiben über alle Runden erhalten, damit falsche Wörter wiederkommen (je Thema und Filter)
+    schedulers: Dict[Tuple[Optional[str], str], LeitnerScheduler] = {}
+    # Position in der gemischten Liste; mit Lernverlauf auch über Programmstarts hinweg
+    decks: Dict[Tuple[Optional[str], str], QuestionDeck] = {}
+    timer = ResponseTimes() if ResponseTimes is not None else None
+    topic: Optional[str] = None   # None = alle Themen
+    word_filter = ""              # "" = kein Filter, sonst wie parse_query
+    index: Optional[SearchIndex] = None   # erst beim ersten Nachschlagen gebaut
+    words = vok
+
+    def get_index() -> SearchIndex:
+        nonlocal index
+        if index is None:
+            index = SearchIndex(vok)
+        return index
+
+    def select() -> Vocab:
+        base = vok if topic is None else {en: vok[en] for en in topics[topic]}
+        if not word_filter:
+            return base
+        q, substring = parse_query(word_filter)
+        hits = sorted(get_index().find(q, substring))   # Reihenfolge wie in vok
+        keys = get_index().keys
+        return {keys[c]: vok[keys[c]] for c in hits if keys[c] in base}
 
     while True:
-        print("Modus: 1=Englisch→Deutsch, 2=Deutsch→Englisch, 3=Gemischt")
-        mode = read_int("Wähle Modus (1/2/3, 0=Ende): ", default=3, valid={0, 1, 2, 3})
+        modes = "Modus: 1=Englisch→Deutsch, 2=Deutsch→Englisch, 3=Gemischt, 4=Wiederholen, 5=Statistik"
+        valid = {0, 1, 2, 3, 4, 5, 7, 8}
+        if topics:
+            modes += f", 6=Thema (jetzt: {topic or 'alle'})"
+            valid.add(6)
+        modes += f", 7=Nachschlagen, 8=Filter (jetzt: {word_filter or 'aus'})"
+        print(modes)
+        mode = read_int(f"Wähle Modus (1-{max(valid)}, 0=Ende): ", default=3, valid=valid)
         if mode == 0:
             print("Beendet.")
             return
+        if mode == 5:
+            print_stats(store)
+            continue
+        if mode == 6:
+            topic = choose_topic(topics)
+            words = select()
+            print(f"{len(words)} Wörter im Thema {topic or 'alle'}.\n")
+            continue
+        if mode == 7:
+            query = input("Suchen (Anfang, *teil für enthält): ")
+            if query.strip("* "):
+                lookup(get_index(), vok, query)
+            continue
+        if mode == 8:
+            word_filter = input("Filter (z.B. ab = beginnt mit, *ab = enthält, leer = aus): ").strip()
+            if not parse_query(word_filter)[0]:
+                word_filter = ""
+            words = select()
+            if not words:
+                print("Keine passenden Wörter, Filter aus.")
+                word_filter = ""
+                words = select()
+            print(f"{len(words)} Wörter ausgewählt.\n")
+            continue
 
         n = read_int("Anzahl Fragen (leer=20, 0=Ende): ", default=20)
         if n == 0:
             print("Beendet.")
             return
 
-        correct, total = ask(vok, rev, mode, n)
+        selection = (topic, word_filter)
+        scheduler = schedulers.get(selection)
+        if mode == 4 and scheduler is None:
+            scheduler = schedulers[selection] = LeitnerScheduler(len(words))
+        state_key = f"deck:{topic or ''}" + (f":{word_filter}" if word_filter else "")
+        deck = decks.get(selection)
+        if deck is None:
+            saved = store.load_state("vokabeln", state_key) if store is not None else None
+            deck = decks[selection] = QuestionDeck.restore(words, saved)
+        if timer is not None:
+            timer.clear()
+        correct, total = ask(words, rev, mode, n, answers, scheduler, store, fuzzy, timer=timer, deck=deck)
+        if store is not None:
+            store.save_state("vokabeln", state_key, deck.state())
+            store.flush()
 
         pct = (correct / total * 100.0) if total else 0.0
         note = grade_from_percent(pct)
         print("\nErgebnis:")
         print(f"richtig: {correct}/{total} ({pct:.1f} %)")
-        print(f"Note: {note}\n")
+        print(f"Note: {note}")
+        if timer is not None:
+            report = timer.finish_round("vokabeln", "Wörter")
+            if report:
+                print(report)
+        print()
         # Danach automatisch zurück zum Anfang der Schleife
 
 if __name__ == "__main__":
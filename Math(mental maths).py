@@ -5,15 +5,66 @@
 import random
 import operator
 import time
-import math
 import sys
+import os
+import re
+from fractions import Fraction
+from importlib.util import find_spec
+
+# NumPy und Tkinter werden erst bei Bedarf geladen (load_numpy/load_tk), damit
+# der Shell-Modus ohne die großen Importe bis zur ersten Eingabe kommt.
+np = None
+_np_checked = False
+tk = ttk = messagebox = tkfont = None
+HAS_TK = find_spec("tkinter") is not None
+
+def load_numpy():
+    """Importiert NumPy beim ersten Aufruf; None, wenn nicht installiert."""
+    global np, _np_checked
+    if not _np_checked:
+        _np_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
+def load_tk():
+    """Importiert Tkinter beim ersten Aufruf; False, wenn es nicht nutzbar ist."""
+    global tk, ttk, messagebox, tkfont
+    if tk is None and HAS_TK:
+        try:
+            import tkinter
+            from tkinter import ttk as _ttk, messagebox as _messagebox
+            import tkinter.font as _tkfont
+        except Exception:
+            return False
+        tk, ttk, messagebox, tkfont = tkinter, _ttk, _messagebox, _tkfont
+    return tk is not None
+
+# Sitzung, Bewertung und Eingabe teilen sich beide Trainer (trainer_core.py daneben)
+import trainer_core
+from trainer_core import console_answer
+
+try:
+    from progress_store import ProgressStore
+except ImportError:
+    # Skript einzeln heruntergeladen: läuft ohne Lernverlauf
+    ProgressStore = None
 
 try:
-    import tkinter as tk
-    from tkinter import ttk, messagebox
-    import tkinter.font as tkfont
-except Exception:
-    tk = None
+    from response_times import ResponseTimes
+except ImportError:
+    ResponseTimes = None
+
+# --- Profiling ---
+# --profile[=VERZEICHNIS] bzw. LERNTRAINER_PROFILE: cProfile getrennt für Laden und
+# Sitzung, dazu die Zähler als JSON (siehe trainer_core.Instrumentation).
+INSTR = trainer_core.Instrumentation("mathe")
+_count = INSTR.count
+_phase = INSTR.phase
+counters = INSTR.counters
 
 # --- Konfiguration ---
 OPS = {
@@ -23,7 +74,9 @@ OPS = {
     '/': {'func': operator.truediv, 'low': -100, 'high': 100, 'weight': 3}
 }
 PENALTY_RATIO = 0.25
-TOL_DIV = 1e-2
+# Division: Dezimalantworten brauchen mind. so viele Nachkommastellen und müssen korrekt gerundet sein
+DIV_PLACES = 2
+# (mindestprozent, note), ausgewertet von trainer_core.grade_for
 GRADE_THRESHOLDS = [(90,"1.0"), (80,"2.0"), (65,"3.0"), (50,"4.0"), (30,"5.0"), (0,"6.0")]
 
 # --- Utility: zuverlässiges Zentrieren des Fensters ---
@@ -54,53 +107,340 @@ def center_window(root, width=None, height=None, _tries=0):
     root.update_idletasks()
 
 # --- Gemeinsame Logik ---
-def generate_task_for_op(op_symbol):
-    cfg = OPS[op_symbol]
-    low, high = cfg['low'], cfg['high']
-    a = random.randint(low, high)
-    b = random.randint(low, high)
+def exact_result(a, b, op_symbol):
+    """Exaktes Ergebnis: int, bei Division mit Rest ein gekürzter Bruch."""
     if op_symbol == '/':
-        while b == 0:
-            b = random.randint(low, high)
-    return a, b, cfg['func'], cfg['weight']
+        q, r = divmod(a, b)
+        return q if r == 0 else Fraction(a, b)
+    return OPS[op_symbol]['func'](a, b)
 
-def evaluate_answer(a, b, op_symbol, user_input):
-    func = OPS[op_symbol]['func']; weight = OPS[op_symbol]['weight']; possible = weight
-    try:
-        user_val = float(str(user_input).replace(',', '.'))
-    except Exception:
-        return False, -PENALTY_RATIO * weight, possible
+def _sample_block(op_symbol, n, rng, low, high):
+    """n Aufgaben (a, b) für einen Operator; Divisoren ohne Verwerfen ungleich 0."""
+    nonzero = op_symbol == '/' and low <= 0 <= high
+    if np is not None:
+        a = rng.integers(low, high + 1, size=n)
+        # ohne die 0 gibt es eine Zahl weniger; alles ab 0 rückt um eins auf
+        b = rng.integers(low, high + (0 if nonzero else 1), size=n)
+        if nonzero: b += (b >= 0)
+        return a.tolist(), b.tolist()
+    a = rng.choices(range(low, high + 1), k=n)
+    if nonzero:
+        b = [x + (x >= 0) for x in rng.choices(range(low, high), k=n)]
+    else:
+        b = rng.choices(range(low, high + 1), k=n)
+    return a, b
+
+class TaskPool:
+    """
+    Aufgabenvorrat: erzeugt blockweise `block` Aufgaben auf einmal (mit NumPy
+    vektorisiert, sonst über random.choices) samt exaktem Ergebnis (int oder
+    Fraction, siehe exact_result), sodass next_task() nur noch den nächsten
+    Eintrag abholt. Aufgaben sind Tupel (a, b, op, func, weight, ergebnis).
+    Ohne seed kommt er aus dem globalen random, random.seed() legt also auch
+    die Aufgaben fest (headless.run_session, ReplayAnswers).
+    """
+    def __init__(self, ops, block=1024, seed=None):
+        if not ops: raise ValueError("Keine Operatoren")
+        self.ops = list(ops); self.block = block
+        if seed is None: seed = random.getrandbits(64)
+        load_numpy()
+        self.rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+        self._tasks = []; self._pos = 0
+
+    def _draw_ops(self, n):
+        # Index in self.ops pro Aufgabe, gleichverteilt
+        k = len(self.ops)
+        if np is not None:
+            return self.rng.integers(0, k, size=n).tolist()
+        return self.rng.choices(range(k), k=n)
+
+    def _range(self, op):
+        return OPS[op]['low'], OPS[op]['high']
+
+    def _refill(self):
+        k = len(self.ops)
+        which = self._draw_ops(self.block)
+        counts = [0] * k
+        for w in which: counts[w] += 1
+        per_op = []
+        for i, op in enumerate(self.ops):
+            cfg = OPS[op]
+            a, b = _sample_block(op, counts[i], self.rng, *self._range(op))
+            if op == '/': res = [exact_result(x, y, op) for x, y in zip(a, b)]
+            else: res = list(map(cfg['func'], a, b))
+            per_op.append(iter(zip(a, b, [op] * counts[i], [cfg['func']] * counts[i],
+                                   [cfg['weight']] * counts[i], res)))
+        # Operatoren in der gezogenen Reihenfolge mischen
+        self._tasks = [next(per_op[w]) for w in which]; self._pos = 0
+        _count('aufgaben_erzeugt', self.block); _count('aufgabenbloecke')
+
+    def next_task(self):
+        if self._pos >= len(self._tasks): self._refill()
+        task = self._tasks[self._pos]; self._pos += 1
+        return task
+
+    def take(self, n):
+        """n Aufgaben am Stück, z.B. für ein Arbeitsblatt."""
+        return [self.next_task() for _ in range(n)]
+
+    def record(self, op, a, b, correct, seconds):
+        # Fester Vorrat: Ergebnisse ändern nichts (siehe AdaptiveTaskPool)
+        pass
+
+def _build_alias(weights):
+    """Alias-Tabelle nach Vose: danach zieht man in O(1) proportional zu weights."""
+    k = len(weights); total = float(sum(weights))
+    scaled = [w * k / total for w in weights]
+    prob = [1.0] * k; alias = list(range(k))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]; alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    return prob, alias
+
+class AdaptiveDifficulty:
+    """
+    Passt Zahlenbereich und Operator-Häufigkeit an den Lernenden an.
+
+    Pro Operator gibt es eine Stufe L: Operanden liegen in [-10^L, 10^L]
+    (begrenzt durch OPS low/high). Für jede Kombination aus Operator und
+    Größenordnung (Stellen des größeren Operanden) werden Trefferquote und
+    Antwortzeit als gleitender Mittelwert geführt. Auf der aktuellen Stufe:
+    sicher und schnell -> Stufe hoch, unsicher oder sehr langsam -> Stufe runter.
+    Schwächere Operatoren werden häufiger gezogen: Gewichte aus einer langsamer
+    geglätteten Trefferquote pro Operator, die Alias-Tabelle wird erst neu
+    gebaut, wenn ein Gewicht um mehr als REBUILD_DELTA vom Stand beim letzten
+    Aufbau abweicht (bei nur einem Operator nie).
+    """
+    ALPHA = 0.25          # Glättung der Mittelwerte pro Stufe
+    OP_ALPHA = 0.05       # Glättung der Trefferquote pro Operator (Gewichte)
+    MIN_ANSWERS = 4       # Antworten auf einer Stufe, bevor sie wechseln darf
+    UP_ACC, DOWN_ACC = 0.85, 0.55
+    REBUILD_DELTA = 0.15  # Abweichung eines Gewichts, ab der die Alias-Tabelle neu gebaut wird
+
+    def __init__(self, ops, target_time=8.0, seed=None):
+        self.ops = list(ops); self.target_time = target_time
+        self.rng = random.Random(random.getrandbits(64) if seed is None else seed)
+        # höchste Stufe: 10^L deckt den OPS-Bereich gerade ab (100 -> 2, 99999 -> 5)
+        self.max_level = {op: max(1, len(str(max(abs(OPS[op]['low']), abs(OPS[op]['high'])) - 1))) for op in self.ops}
+        self.level = {op: 1 for op in self.ops}
+        self.stats = {}   # (op, stellen) -> [anzahl, trefferquote, zeit]
+        self.op_acc = {op: 0.7 for op in self.ops}
+        self._at_level = {op: 0 for op in self.ops}
+        self._weights = [self._weight(op) for op in self.ops]
+        self._prob, self._alias = _build_alias(self._weights)
+
+    def _weight(self, op):
+        return 0.25 + (1.0 - self.op_acc[op])
+
+    def choose(self):
+        """Index eines Operators in self.ops, O(1)."""
+        i = self.rng.randrange(len(self.ops))
+        return i if self.rng.random() < self._prob[i] else self._alias[i]
+
+    def range_for(self, op):
+        cfg = OPS[op]; lim = 10 ** self.level[op]
+        low, high = max(cfg['low'], -lim), min(cfg['high'], lim)
+        if op == '/' and low == high == 0: high = 1
+        return low, high
+
+    def record(self, op, a, b, correct, seconds):
+        """Verbucht eine Antwort; True, wenn sich eine Stufe geändert hat."""
+        al = self.ALPHA
+        bucket = len(str(max(abs(a), abs(b))))
+        st = self.stats.get((op, bucket))
+        if st is None:
+            st = self.stats[(op, bucket)] = [0, 0.7, self.target_time]
+        st[0] += 1
+        st[1] += al * (float(correct) - st[1])
+        st[2] += al * (seconds - st[2])
+        self.op_acc[op] += self.OP_ALPHA * (float(correct) - self.op_acc[op])
+
+        changed = False
+        self._at_level[op] += 1
+        if self._at_level[op] >= self.MIN_ANSWERS and bucket >= self.level[op]:
+            lvl = self.level[op]
+            if st[1] >= self.UP_ACC and st[2] <= self.target_time and lvl < self.max_level[op]:
+                self.level[op] = lvl + 1
+            elif (st[1] < self.DOWN_ACC or st[2] > 2 * self.target_time) and lvl > 1:
+                self.level[op] = lvl - 1
+            if self.level[op] != lvl:
+                self._at_level[op] = 0; changed = True
+
+        if len(self.ops) > 1:
+            i = self.ops.index(op)   # nur dieses Gewicht kann sich bewegt haben
+            if abs(self._weight(op) - self._weights[i]) > self.REBUILD_DELTA:
+                self._weights = [self._weight(o) for o in self.ops]
+                self._prob, self._alias = _build_alias(self._weights)
+                _count('gewichte_neu')
+        return changed
+
+    def describe(self):
+        return ", ".join(f"{op} bis {self.range_for(op)[1]}" for op in self.ops)
+
+class AdaptiveTaskPool(TaskPool):
+    """TaskPool mit AdaptiveDifficulty: kleine Blöcke, verworfen sobald sich eine Stufe ändert
+    (neue Gewichte gelten ab dem nächsten Block)."""
+    def __init__(self, difficulty, block=16, seed=None):
+        super().__init__(difficulty.ops, block=block, seed=seed)
+        self.difficulty = difficulty
+
+    def _draw_ops(self, n):
+        choose = self.difficulty.choose
+        return [choose() for _ in range(n)]
+
+    def _range(self, op):
+        return self.difficulty.range_for(op)
+
+    def record(self, op, a, b, correct, seconds):
+        if self.difficulty.record(op, a, b, correct, seconds):
+            _count('schwierigkeit_angepasst')
+            self._tasks = []; self._pos = 0
+
+_INT_RE = re.compile(r"[+-]?\d+")
+_FRAC_RE = re.compile(r"([+-]?\d+)/([+-]?\d+)")
+# 2.5, -,75, 0.(3) bzw. 2.1(6) für Perioden
+_DEC_RE = re.compile(r"([+-]?)(\d*)\.(\d*)(?:\((\d+)\))?")
+
+def _parse(text):
+    """(zähler, nenner, nachkommastellen) als ints oder None; siehe parse_exact."""
     try:
-        true_val = func(a, b)
-    except Exception:
-        return False, -PENALTY_RATIO * weight, possible
-    tol = TOL_DIV if op_symbol == '/' else 1e-9
-    if math.isfinite(true_val) and abs(user_val - true_val) <= tol:
+        return _parse_digits(str(text).strip())
+    except ValueError:
+        # mehr Ziffern, als int() umwandelt (sys.get_int_max_str_digits): einfach falsch
+        return None
+
+def _parse_digits(s):
+    if _INT_RE.fullmatch(s):
+        return int(s), 1, None
+    s = s.replace(',', '.').replace(' ', '')
+    m = _FRAC_RE.fullmatch(s)
+    if m:
+        num, den = int(m.group(1)), int(m.group(2))
+        if not den: return None
+        return (-num, -den, None) if den < 0 else (num, den, None)
+    m = _DEC_RE.fullmatch(s)
+    if not m:
+        return None
+    sign, whole, frac, period = m.groups()
+    if not (whole or frac or period):
+        return None
+    num, den = int(whole + frac or "0"), 10 ** len(frac)
+    if period:
+        # x.f(p) = (wf * (10^k - 1) + p) / (10^|f| * (10^k - 1))
+        nines = 10 ** len(period) - 1
+        num, den = num * nines + int(period), den * nines
+    return (-num if sign == '-' else num), den, (None if period else len(frac))
+
+def parse_exact(text):
+    """
+    Eingabe exakt lesen: (wert, nachkommastellen) oder None.
+    Ganze Zahlen, Dezimalzahlen mit Punkt oder Komma, Brüche wie 7/3 und
+    Perioden wie 2.(3). nachkommastellen ist None, wenn der Wert nicht als
+    abbrechende Dezimalzahl eingegeben wurde (Bruch, Periode, ganze Zahl).
+    """
+    parsed = _parse(text)
+    if parsed is None:
+        return None
+    num, den, places = parsed
+    return (num if den == 1 else Fraction(num, den)), places
+
+def evaluate_answer(a, b, op_symbol, user_input, exact=None):
+    """
+    Exakte Bewertung gegen exact (aus der TaskPool-Aufgabe, sonst neu berechnet).
+    Bei Division zählt auch eine Dezimalzahl mit mind. DIV_PLACES Stellen,
+    die das Ergebnis auf ihre Stellenzahl korrekt gerundet wiedergibt.
+    """
+    weight = OPS[op_symbol]['weight']; possible = weight
+    if exact is None:
+        try: exact = exact_result(a, b, op_symbol)
+        except ZeroDivisionError: return False, -PENALTY_RATIO * weight, possible
+    if type(exact) is int and type(user_input) is str:
+        # schneller Weg: ganzzahliges Ergebnis, ganzzahlige Eingabe
+        s = user_input.strip()
+        if _INT_RE.fullmatch(s):
+            try: ok = int(s) == exact
+            except ValueError: ok = False   # zu viele Ziffern für int()
+            if ok: return True, weight, possible
+            return False, -PENALTY_RATIO * weight, possible
+    wrong = (False, -PENALTY_RATIO * weight, possible)
+    parsed = _parse(user_input)
+    if parsed is None:
+        return wrong
+    num, den, places = parsed
+    # über Kreuz multipliziert: alles bleibt int, kein Fraction-Objekt pro Antwort
+    if type(exact) is int: e_num, e_den = exact, 1
+    else: e_num, e_den = exact.numerator, exact.denominator
+    diff = num * e_den - e_num * den
+    if diff == 0:
+        return True, weight, possible
+    # |wert - exakt| <= 0,5 * 10^-stellen, mit nenner = 10^stellen also 2*|diff| <= e_den
+    if op_symbol == '/' and places is not None and places >= DIV_PLACES and 2 * abs(diff) <= e_den:
         return True, weight, possible
-    return False, -PENALTY_RATIO * weight, possible
+    return wrong
 
 def calculate_grade(points, possible):
-    if possible <= 0:
-        return 0.0, "6.0"
-    pct = max(0.0, min(100.0, (points / possible) * 100.0))
-    for thresh, grade in GRADE_THRESHOLDS:
-        if pct >= thresh:
-            return pct, grade
-    return pct, "6.0"
-
-def format_result_for_display(func, a, b, op_symbol):
+    pct = trainer_core.percent(points, possible)
+    return pct, trainer_core.grade_for(pct, GRADE_THRESHOLDS)
+
+def _round_places(num, den, places):
+    """num/den auf places Stellen als Text, kaufmännisch gerundet (0,5 weg von der Null)."""
+    n = (2 * abs(num) * 10 ** places + den) // (2 * den)
+    digits = str(n).rjust(places + 1, '0')
+    sign = '-' if num < 0 and n else ''
+    return f"{sign}{digits[:-places]}.{digits[-places:]}"
+
+def format_result_for_display(func, a, b, op_symbol, exact=None):
     try:
-        r = func(a, b)
-        if op_symbol == '/':
-            return f"{r:.2f}"
-        if float(r).is_integer():
-            return str(int(r))
-        return str(r)
-    except Exception:
+        r = exact_result(a, b, op_symbol) if exact is None else exact
+    except ZeroDivisionError:
         return "Fehler"
+    if op_symbol == '/':
+        if type(r) is int: return _round_places(r, 1, DIV_PLACES)
+        return _round_places(r.numerator, r.denominator, DIV_PLACES)
+    return str(r)
+
+class MathTasks:
+    """
+    Aufgabentyp "mathe" (Plugin für trainer_core): Aufgaben aus einem
+    TaskPool, bewertet mit evaluate_answer. Aufgaben sind
+    (prompt, lösung, "a op b", op, (a, b, op, ergebnis)).
+    """
+    name = "mathe"; label = "Operatoren"; thresholds = GRADE_THRESHOLDS; timer_key = "kind"
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def next_task(self):
+        a, b, op, func, _, exact = self.pool.next_task()
+        solution = format_result_for_display(func, a, b, op, exact)
+        return f"{a} {op} {b} = ", solution, f"{a} {op} {b}", op, (a, b, op, exact)
+
+    def solution(self, task):
+        return task[1]
+
+    def grade(self, task, user_input):
+        a, b, op, exact = task[4]
+        ok, earned, possible = evaluate_answer(a, b, op, user_input, exact)
+        return ok, earned, possible, "Richtig." if ok else f"Falsch. Richtige Antwort: {task[1]}"
+
+    def review(self, task, correct, seconds):
+        a, b, op, _ = task[4]
+        self.pool.record(op, a, b, correct, seconds)
+
+def new_session(pool, mode, value, store=None, timer=None):
+    """Runde über einem TaskPool: mode 'anzahl' (value Aufgaben) oder 'zeit' (value Minuten)."""
+    n = value if mode == 'anzahl' else None
+    seconds = value * 60 if mode == 'zeit' else None
+    return trainer_core.Session(MathTasks(pool), n, seconds, store, timer)
 
 # --- Shell-Modus ---
-def shell_menu():
+def shell_menu(store=None):
+    timer = ResponseTimes() if ResponseTimes is not None else None
+    difficulty = None   # bleibt über Runden erhalten, solange die Operatoren gleich sind
     while True:
         print("\nMathe-Kopfrechentrainer — Shell-Modus (Privat)")
         print("Wähle Operatoren (z.B. + - * /). 'q' zum Beenden.")
@@ -112,48 +452,75 @@ def shell_menu():
             print("Keine gültigen Operatoren gewählt."); continue
         mode = input("Modus ('anzahl' oder 'zeit') -> ").strip().lower()
         if mode not in ('anzahl','zeit'): print("Ungültiger Modus."); continue
+        adaptive = input("Schwierigkeit anpassen? (j/n) -> ").strip().lower() == 'j'
+        if not adaptive: difficulty = None
+        elif difficulty is None or difficulty.ops != selected_ops:
+            difficulty = AdaptiveDifficulty(selected_ops)
         val_raw = input(("Anzahl Aufgaben -> " if mode=='anzahl' else "Dauer in Minuten -> ")).strip()
         try:
             value = int(val_raw); 
             if value <= 0: raise ValueError
         except ValueError:
             print("Ungültige Zahl."); continue
-        shell_session(selected_ops, mode, value)
+        shell_session(selected_ops, mode, value, store, timer=timer, difficulty=difficulty)
+        input("\nDrücke Enter zum Zurückkehren...")
         again = input("Nochmal? (j/n) -> ").strip().lower()
         if again != 'j': break
 
-def shell_session(selected_ops, mode, value):
-    total_tasks = 0; points = 0.0; possible = 0.0; start = time.time()
-    time_limit = value * 60 if mode == 'zeit' else None
+def shell_session(selected_ops, mode, value, store=None, read_answer=console_answer, timer=None,
+                  difficulty=None):
+    """Eine Runde im Terminal; read_answer(prompt, lösung) liefert die Eingaben,
+    timer sammelt die Antwortzeiten pro Operator, difficulty passt die Aufgaben an."""
+    if timer is not None: timer.clear()
+    pool = AdaptiveTaskPool(difficulty) if difficulty is not None else TaskPool(selected_ops)
+    session = new_session(pool, mode, value, store, timer); score = session.score
+    start = time.monotonic()
     print("\nSession startet. Tippe 'q' zum Abbrechen.\n")
     while True:
-        if mode == 'anzahl' and total_tasks >= value: break
-        if mode == 'zeit' and time.time() - start >= time_limit: break
-        op_symbol = random.choice(selected_ops)
-        a, b, func, weight = generate_task_for_op(op_symbol)
-        ans = input(f"{a} {op_symbol} {b} = ")
+        prompt = session.next_question()
+        if prompt is None: break
+        solution = session.task[1]
+        t0 = time.perf_counter()
+        if session.deadline is not None and read_answer is console_answer:
+            # Frist gilt auch während des Wartens auf die Eingabe
+            ans = console_answer(prompt, solution, session.deadline - time.monotonic())
+        else:
+            ans = read_answer(prompt, solution)
+        dt = time.perf_counter() - t0
+        if ans is None:
+            print("\nZeit abgelaufen."); break
         if ans.strip().lower() == 'q': break
-        is_corr, earned, poss = evaluate_answer(a, b, op_symbol, ans)
-        points += earned; possible += poss; total_tasks += 1
-        if is_corr: print("Richtig.")
-        else: print(f"Falsch. Richtige Antwort: {format_result_for_display(func,a,b,op_symbol)}")
-        pct,_ = calculate_grade(points, possible)
-        print(f"Punkte: {points:.2f} / {possible:.2f}  ({pct:.1f}%)\n")
-    elapsed = time.time() - start; pct, grade = calculate_grade(points, possible)
+        print(session.answer(ans, dt)[1])
+        pct,_ = calculate_grade(score.points, score.possible)
+        print(f"Punkte: {score.points:.2f} / {score.possible:.2f}  ({pct:.1f}%)\n")
+    elapsed = time.monotonic() - start; pct, grade = calculate_grade(score.points, score.possible)
+    _count('aufgaben_beantwortet', score.total); _count('runden')
+    report = session.finish()   # schreibt den Lernverlauf
     print("\n--- Auswertung ---")
-    print(f"Punkte: {points:.2f} / {possible:.2f}")
+    print(f"Punkte: {score.points:.2f} / {score.possible:.2f}")
     print(f"Prozent: {pct:.1f}%    Note: {grade}")
     print(f"Dauer: {int(elapsed//60)}m {int(elapsed%60)}s")
-    input("\nDrücke Enter zum Zurückkehren...")
+    if difficulty is not None: print(f"Schwierigkeit: {difficulty.describe()}")
+    if report: print(report)
+    return score.points, score.possible, score.total
 
 # --- GUI-Modus (zentriert & responsiv) ---
-if tk is not None:
+if HAS_TK:
+    # Die Methoden greifen erst zur Laufzeit auf tk/ttk zu; vorher load_tk() aufrufen
     class TrainerGUI:
-        def __init__(self, root):
+        # Schriftgröße = max(minimum, int(basis * skala)); Skala in 5-%-Stufen
+        FONT_SIZES = {'heading': (20, 12), 'normal': (12, 9), 'large': (28, 14), 'small': (10, 8)}
+        SCALE_STEPS = 20
+        FEEDBACK_SECS = 0.6   # Rückmeldung sichtbar, bevor die nächste Aufgabe kommt
+
+        def __init__(self, root, store=None):
             self.root = root
+            self.store = store
+            self.timer = ResponseTimes() if ResponseTimes is not None else None
             root.title("Mathe-Kopfrechentrainer — GUI (responsiv)")
             self.selected_ops = {op: tk.BooleanVar(value=True) for op in OPS}
             self.mode = tk.StringVar(value='anzahl')
+            self.adaptive = tk.BooleanVar(value=False); self.difficulty = None
             self.value = tk.IntVar(value=10)
             self.fonts = {
                 'heading': tkfont.Font(family="Helvetica", size=18, weight="bold"),
@@ -161,33 +528,49 @@ if tk is not None:
                 'large'  : tkfont.Font(family="Helvetica", size=22, weight="bold"),
                 'small'  : tkfont.Font(family="Helvetica", size=10)
             }
+            # ttk-Buttons & Co. haben keine font-Option: über den Style an die
+            # benannten Schriften hängen, dann folgen sie jeder Größenänderung
+            style = ttk.Style(root)
+            for widget_style in ('TLabel', 'TButton', 'TCheckbutton', 'TRadiobutton'):
+                style.configure(widget_style, font=self.fonts['normal'])
+            self._scale_bucket = None
             self.session_running = False
-            self.points = 0.0; self.possible = 0.0; self.total_tasks = 0
-            self.current_task = None; self.time_limit = 0; self.start_time = None
+            self.session = None
+            self.current_task = None; self.deadline = None; self._advance_at = None
+            self._tick_id = None
             self.fullscreen = False
             self._resize_after_id = None
             root.bind('<F11>', lambda e: self.toggle_fullscreen())
             root.bind('<Escape>', lambda e: self.exit_fullscreen())
             root.bind('<Configure>', self._on_configure_debounced)
-            self.build_main_menu()
+            self._build_screens()
+            self.show_main_menu()
             # initial scale
             self.on_resize()
 
         def _on_configure_debounced(self, event):
+            # <Configure> am Toplevel kommt auch für jedes Kind-Widget an
+            if event.widget is not self.root: return
+            _count('resize_ereignisse')
             if self._resize_after_id:
                 try: self.root.after_cancel(self._resize_after_id)
                 except Exception: pass
             self._resize_after_id = self.root.after(80, self.on_resize)
 
-        def on_resize(self):
-            w = max(320, self.root.winfo_width()); h = max(240, self.root.winfo_height())
-            scale_w = w / 900.0; scale_h = h / 650.0
-            scale = min(scale_w, scale_h); scale = max(0.7, min(scale, 3.5))
-            self.fonts['heading'].configure(size=max(12, int(20 * scale)))
-            self.fonts['normal'].configure(size=max(9, int(12 * scale)))
-            self.fonts['large'].configure(size=max(14, int(28 * scale)))
-            self.fonts['small'].configure(size=max(8, int(10 * scale)))
-            self._apply_fonts_to_widgets()
+        def on_resize(self, width=None, height=None):
+            """Skaliert die vier benannten Schriften; alle Widgets verweisen darauf."""
+            self._resize_after_id = None
+            w = max(320, width or self.root.winfo_width()); h = max(240, height or self.root.winfo_height())
+            scale = min(w / 900.0, h / 650.0); scale = max(0.7, min(scale, 3.5))
+            bucket = round(scale * self.SCALE_STEPS)
+            if bucket == self._scale_bucket: return False
+            self._scale_bucket = bucket; scale = bucket / self.SCALE_STEPS
+            _count('schrift_skaliert')
+            for name, (base, minimum) in self.FONT_SIZES.items():
+                size = max(minimum, int(base * scale))
+                font = self.fonts[name]
+                if font.cget('size') != size: font.configure(size=size)
+            return True
 
         def toggle_fullscreen(self):
             self.fullscreen = not self.fullscreen
@@ -197,34 +580,25 @@ if tk is not None:
             self.fullscreen = False
             self.root.attributes('-fullscreen', False)
 
-        def _apply_fonts_to_widgets(self):
-            try:
-                if hasattr(self, 'main_title'): self.main_title.configure(font=self.fonts['heading'])
-                if hasattr(self, 'ops_frame'):
-                    for child in self.ops_frame.winfo_children():
-                        try: child.configure(font=self.fonts['normal'])
-                        except Exception: pass
-                if hasattr(self, 'spin_value'):
-                    try: self.spin_value.configure(font=self.fonts['normal'])
-                    except Exception: pass
-                if hasattr(self, 'question_label'): self.question_label.configure(font=self.fonts['large'])
-                if hasattr(self, 'answer_entry'):
-                    try: self.answer_entry.configure(font=self.fonts['normal'])
-                    except Exception: pass
-                if hasattr(self, 'score_label'): self.score_label.configure(font=self.fonts['normal'])
-                if hasattr(self, 'timer_label'): self.timer_label.configure(font=self.fonts['small'])
-                if hasattr(self, 'feedback_label'): self.feedback_label.configure(font=self.fonts['normal'])
-                if hasattr(self, 'session_buttons'):
-                    for btn in self.session_buttons:
-                        try: btn.configure(font=self.fonts['normal'])
-                        except Exception: pass
-            except Exception:
-                pass
+        # Alle Bildschirme werden einmal gebaut und liegen übereinander in derselben
+        # Gitterzelle; ein Wechsel hebt nur den passenden Frame nach oben (tkraise)
+        # und füllt ihn mit neuen Daten, es entstehen dabei keine neuen Widgets.
+        def _build_screens(self):
+            container = ttk.Frame(self.root); container.pack(fill='both', expand=True)
+            container.rowconfigure(0, weight=1); container.columnconfigure(0, weight=1)
+            self.screens = {}
+            for name, build in (('menu', self._build_menu_screen),
+                                ('session', self._build_session_screen),
+                                ('result', self._build_result_screen)):
+                screen = ttk.Frame(container); screen.grid(row=0, column=0, sticky='nsew')
+                build(screen); self.screens[name] = screen
+            _count('bildschirme_aufgebaut', len(self.screens))
+
+        def _show(self, name):
+            self.screens[name].tkraise()
 
         # zentriertes Hauptmenü mit place(relx=0.5,rely=0.5,anchor='center')
-        def build_main_menu(self):
-            for w in self.root.winfo_children(): w.destroy()
-            outer = ttk.Frame(self.root); outer.pack(fill='both', expand=True)
+        def _build_menu_screen(self, outer):
             frm = ttk.Frame(outer, padding=12)
             frm.place(relx=0.5, rely=0.5, anchor='center')
             self.main_title = ttk.Label(frm, text="Mathe-Kopfrechentrainer — GUI", anchor='center')
@@ -239,127 +613,197 @@ if tk is not None:
             r1 = ttk.Radiobutton(frm, text="Anzahl Aufgaben", variable=self.mode, value='anzahl')
             r2 = ttk.Radiobutton(frm, text="Zeit (Minuten)", variable=self.mode, value='zeit')
             r1.grid(row=4, column=0, sticky='w'); r2.grid(row=4, column=1, sticky='w')
+            ttk.Checkbutton(frm, text="Schwierigkeit anpassen", variable=self.adaptive).grid(row=4, column=2, sticky='w')
             ttk.Label(frm, text="Wert (Anzahl oder Minuten):").grid(row=5, column=0, sticky='w', pady=(10,0))
-            self.spin_value = ttk.Spinbox(frm, from_=1, to=10000, textvariable=self.value, width=8)
+            self.spin_value = ttk.Spinbox(frm, from_=1, to=10000, textvariable=self.value, width=8,
+                                          font=self.fonts['normal'])
             self.spin_value.grid(row=6, column=0, sticky='w')
             start_btn = ttk.Button(frm, text="Start", command=self.start_session_gui)
             start_btn.grid(row=7, column=0, pady=12)
             quit_btn = ttk.Button(frm, text="Beenden", command=self.root.destroy)
             quit_btn.grid(row=7, column=1, pady=12)
-            self.session_buttons = [start_btn, quit_btn]
-            self._apply_fonts_to_widgets()
+
+        def show_main_menu(self):
+            self._show('menu')
 
         def start_session_gui(self):
             ops = [op for op,var in self.selected_ops.items() if var.get()]
             if not ops:
                 messagebox.showwarning("Fehler","Keine Operatoren gewählt."); return
             self.ops = ops
+            if not self.adaptive.get(): self.difficulty = None
+            elif self.difficulty is None or self.difficulty.ops != ops: self.difficulty = AdaptiveDifficulty(ops)
+            pool = AdaptiveTaskPool(self.difficulty) if self.difficulty is not None else TaskPool(ops)
             self.mode_val = self.mode.get(); self.value_val = int(self.value.get())
-            self.points = 0.0; self.possible = 0.0; self.total_tasks = 0
-            self.session_running = True; self.start_time = time.time()
-            self.time_limit = self.value_val * 60 if self.mode_val == 'zeit' else None
-            for w in self.root.winfo_children(): w.destroy()
-            self.build_session_frame()
+            if self.timer is not None: self.timer.clear()
+            self.session = new_session(pool, self.mode_val, self.value_val, self.store, self.timer)
+            self.session_running = True; self._advance_at = None
+            self.deadline = self.session.deadline
+            self.show_session()
             self.next_task_gui()
-            if self.mode_val == 'zeit': self.update_timer_gui()
+            self._schedule()
 
-        def build_session_frame(self):
-            for w in self.root.winfo_children(): w.destroy()
-            outer = ttk.Frame(self.root); outer.pack(fill='both', expand=True)
+        def _build_session_screen(self, outer):
             self.frame = ttk.Frame(outer, padding=12); self.frame.place(relx=0.5, rely=0.5, anchor='center')
             self.score_label = ttk.Label(self.frame, text="Punkte: 0 / 0"); self.score_label.grid(row=0, column=0, sticky='w')
-            self.timer_label = ttk.Label(self.frame, text=""); self.timer_label.grid(row=0, column=1, sticky='e')
-            self.question_var = tk.StringVar(value=""); self.question_label = ttk.Label(self.frame, textvariable=self.question_var)
+            self.timer_label = ttk.Label(self.frame, text="", font=self.fonts['small']); self.timer_label.grid(row=0, column=1, sticky='e')
+            self.question_var = tk.StringVar(value="")
+            self.question_label = ttk.Label(self.frame, textvariable=self.question_var, font=self.fonts['large'])
             self.question_label.grid(row=1, column=0, columnspan=2, pady=12)
-            self.answer_var = tk.StringVar(); self.answer_entry = ttk.Entry(self.frame, textvariable=self.answer_var)
+            self.answer_var = tk.StringVar(); self.answer_entry = ttk.Entry(self.frame, textvariable=self.answer_var, font=self.fonts['normal'])
             self.answer_entry.grid(row=2, column=0, sticky='we'); self.answer_entry.bind("<Return>", lambda e: self.submit_answer_gui())
             submit_btn = ttk.Button(self.frame, text="Antwort prüfen", command=self.submit_answer_gui); submit_btn.grid(row=2, column=1, padx=6)
             self.feedback_label = ttk.Label(self.frame, text=""); self.feedback_label.grid(row=3, column=0, columnspan=2, pady=8)
             self.end_btn = ttk.Button(self.frame, text="Abbrechen (zurück)", command=self.stop_and_return); self.end_btn.grid(row=4, column=0, pady=8)
-            self.session_buttons = [submit_btn, self.end_btn]
             self.frame.columnconfigure(0, weight=1)
-            self._apply_fonts_to_widgets()
+
+        def show_session(self):
+            self.score_label.config(text="Punkte: 0 / 0"); self.timer_label.config(text="")
+            self.question_var.set(""); self.answer_var.set(""); self.feedback_label.config(text="")
+            self._show('session')
             try: self.answer_entry.focus_set()
             except Exception: pass
 
-        def next_task_gui(self):
-            if self.mode_val == 'anzahl' and self.total_tasks >= self.value_val:
+        # Auswertung als wiederverwendetes Panel statt eines neuen Toplevel pro Runde
+        def _build_result_screen(self, outer):
+            frm = ttk.Frame(outer, padding=12); frm.place(relx=0.5, rely=0.5, anchor='center')
+            self.result_title = ttk.Label(frm, text="--- Auswertung ---", font=self.fonts['heading'])
+            self.result_title.grid(row=0, column=0, columnspan=2)
+            self.result_vars = {k: tk.StringVar() for k in ('points', 'pct', 'grade', 'tasks', 'report')}
+            for row, key in enumerate(('points', 'pct', 'grade', 'tasks'), start=1):
+                lbl = ttk.Label(frm, textvariable=self.result_vars[key], font=self.fonts['normal'])
+                lbl.grid(row=row, column=0, columnspan=2, sticky='w')
+            lbl = ttk.Label(frm, textvariable=self.result_vars['report'], justify='left', font=self.fonts['small'])
+            lbl.grid(row=5, column=0, columnspan=2, sticky='w')
+            menu_btn = ttk.Button(frm, text="Zum Hauptmenü", command=self.show_main_menu)
+            menu_btn.grid(row=6, column=0, pady=8)
+            quit_btn = ttk.Button(frm, text="Beenden", command=self.root.destroy)
+            quit_btn.grid(row=6, column=1, pady=8)
+
+        # Ein einziger after()-Rückruf pro Sitzung treibt Countdown, Aufgabenwechsel
+        # und Sitzungsende. Er wacht nur auf, wenn die Restzeit eine volle Sekunde
+        # weiterspringt oder die Rückmeldung abgelaufen ist; alles auf time.monotonic.
+        def _schedule(self):
+            self._cancel_tick()
+            if not self.session_running: return
+            now = time.monotonic(); wake = []
+            if self.deadline is not None:
+                remaining = self.deadline - now
+                wake.append(remaining % 1.0 or 1.0)   # nächster Sekundenwechsel der Anzeige
+            if self._advance_at is not None:
+                wake.append(self._advance_at - now)
+            if wake:
+                self._tick_id = self.root.after(max(1, int(min(wake) * 1000) + 1), self._tick)
+
+        def _cancel_tick(self):
+            if self._tick_id is not None:
+                try: self.root.after_cancel(self._tick_id)
+                except Exception: pass
+                self._tick_id = None
+
+        def _tick(self):
+            self._tick_id = None; _count('ticks')
+            if not self.session_running: return
+            now = time.monotonic()
+            if self.deadline is not None and now >= self.deadline:
                 self.finish_session_gui(); return
-            if self.mode_val == 'zeit' and (time.time() - self.start_time) >= self.time_limit:
+            if self._advance_at is not None and now >= self._advance_at:
+                self._advance_at = None
+                self.next_task_gui()
+                if not self.session_running: return
+            else:
+                self.update_progress_gui()
+            self._schedule()
+
+        def next_task_gui(self):
+            if not self.session_running: return
+            prompt = self.session.next_question()
+            if prompt is None:
                 self.finish_session_gui(); return
-            op = random.choice(self.ops)
-            a, b, func, weight = generate_task_for_op(op)
-            self.current_task = (a, b, op, func, weight)
-            self.question_var.set(f"{a} {op} {b} = ")
+            self.current_task = self.session.task
+            self.task_started = time.perf_counter()
+            self.question_var.set(prompt)
             self.answer_var.set(""); self.feedback_label.config(text=""); self.update_progress_gui()
             try: self.answer_entry.focus_set()
             except Exception: pass
 
         def submit_answer_gui(self):
             if not self.current_task: return
-            a, b, op, func, weight = self.current_task
-            user_input = self.answer_var.get()
-            is_corr, earned, poss = evaluate_answer(a, b, op, user_input)
-            self.points += earned; self.possible += poss; self.total_tasks += 1
-            if is_corr: self.feedback_label.config(text="Richtig.", foreground="green")
-            else:
-                correct = format_result_for_display(func, a, b, op)
-                self.feedback_label.config(text=f"Falsch. richtig: {correct}", foreground="red")
+            self.current_task = None   # kein zweites Bewerten während der Rückmeldung
+            dt = time.perf_counter() - self.task_started
+            is_corr, message = self.session.answer(self.answer_var.get(), dt)
+            _count('aufgaben_beantwortet')
+            self.feedback_label.config(text=message, foreground="green" if is_corr else "red")
             self.update_progress_gui()
-            self.root.after(600, self.next_task_gui)
+            self._advance_at = time.monotonic() + self.FEEDBACK_SECS
+            self._schedule()
 
         def update_progress_gui(self):
-            pct, _ = calculate_grade(self.points, self.possible)
-            self.score_label.config(text=f"Punkte: {self.points:.2f} / {self.possible:.2f}  ({pct:.1f}%)")
-            if self.mode_val == 'zeit':
-                rem = max(0, int(self.time_limit - (time.time() - self.start_time)))
+            score = self.session.score; pct, _ = calculate_grade(score.points, score.possible)
+            self.score_label.config(text=f"Punkte: {score.points:.2f} / {score.possible:.2f}  ({pct:.1f}%)")
+            if self.deadline is not None:
+                rem = max(0, int(self.deadline - time.monotonic()))
                 self.timer_label.config(text=f"Verbleibende Zeit: {rem//60:02d}:{rem%60:02d}")
             else:
-                self.timer_label.config(text=f"Aufgaben: {self.total_tasks} / {self.value_val}")
-
-        def update_timer_gui(self):
-            if not self.session_running: return
-            if self.mode_val != 'zeit': return
-            if (time.time() - self.start_time) >= self.time_limit:
-                self.finish_session_gui(); return
-            self.update_progress_gui(); self.root.after(500, self.update_timer_gui)
+                self.timer_label.config(text=f"Aufgaben: {score.total} / {self.value_val}")
 
         def finish_session_gui(self):
-            self.session_running = False
-            pct, grade = calculate_grade(self.points, self.possible)
-            res = tk.Toplevel(self.root); res.title("Auswertung")
-            frm = ttk.Frame(res, padding=12); frm.pack(fill='both', expand=True)
-            ttk.Label(frm, text="--- Auswertung ---", font=self.fonts['heading']).grid(row=0, column=0, columnspan=2)
-            ttk.Label(frm, text=f"Punkte: {self.points:.2f} / {self.possible:.2f}").grid(row=1, column=0, sticky='w')
-            ttk.Label(frm, text=f"Prozent: {pct:.1f}%").grid(row=2, column=0, sticky='w')
-            ttk.Label(frm, text=f"Note: {grade}").grid(row=3, column=0, sticky='w')
-            ttk.Label(frm, text=f"Bearbeitete Aufgaben: {self.total_tasks}").grid(row=4, column=0, sticky='w')
-            ttk.Button(frm, text="Zum Hauptmenü", command=lambda:(res.destroy(), self.build_main_menu())).grid(row=5, column=0, pady=8)
-            ttk.Button(frm, text="Beenden", command=self.root.destroy).grid(row=5, column=1, pady=8)
+            self.session_running = False; self.current_task = None
+            self._cancel_tick(); self._advance_at = None
+            report = self.session.finish()   # schreibt den Lernverlauf
+            score = self.session.score; pct, grade = calculate_grade(score.points, score.possible)
+            v = self.result_vars
+            v['points'].set(f"Punkte: {score.points:.2f} / {score.possible:.2f}")
+            v['pct'].set(f"Prozent: {pct:.1f}%")
+            v['grade'].set(f"Note: {grade}")
+            v['tasks'].set(f"Bearbeitete Aufgaben: {score.total}")
+            if self.difficulty is not None: report = f"Schwierigkeit: {self.difficulty.describe()}\n{report}"
+            v['report'].set(report)
+            self._show('result')
 
         def stop_and_return(self):
             if messagebox.askyesno("Abbrechen","Session abbrechen und zum Hauptmenü zurück?"):
-                self.session_running = False; self.build_main_menu()
+                self.session_running = False; self.current_task = None
+                self._cancel_tick(); self._advance_at = None; self.show_main_menu()
+                if self.store is not None: self.store.flush()
 
 # --- Startpunkt ---
 def main():
     random.seed()
+    INSTR.start(trainer_core.profile_setting(sys.argv[1:]))
+    store = None
+    if ProgressStore is not None:
+        try: store = ProgressStore()
+        except Exception: print("Lernverlauf nicht verfügbar, es wird nichts gespeichert.")
+    _phase("sitzung")
+    try:
+        main_menu(store)
+    finally:
+        if store is not None: store.close()
+        INSTR.stop()
+
+def main_menu(store=None):
     while True:
         print("Mathe-Kopfrechentrainer — Wahlmodus")
         print("1) Shell (Terminal)")
-        if tk is not None:
+        if HAS_TK:
             print("2) GUI (separates Fenster, benötigt Tkinter)")
         print("q) Beenden")
         choice = input("Auswahl -> ").strip().lower()
         if choice == '1':
-            shell_menu()
-        elif choice == '2' and tk is not None:
+            shell_menu(store)
+        elif choice == '2' and HAS_TK:
+            _phase("laden")   # Tk-Import und Aufbau der Bildschirme
+            if not load_tk():
+                _phase("sitzung")
+                print("Tkinter ist installiert, lässt sich aber nicht laden."); continue
             root = tk.Tk()
             # optionale Startgröße, erleichtert Layout; passt sich später an
             root.geometry("900x650")
-            app = TrainerGUI(root)
+            app = TrainerGUI(root, store)
             # zentrieren nach Aufbau; die Funktion versucht solange bis Größe bekannt ist
             center_window(root, 900, 650)
+            _phase("sitzung")
             root.mainloop()
         elif choice == 'q':
             print("Beende Programm.")
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark für beide Trainer, komplett headless (siehe headless.py).
+
+Misst pro Listengröße (synthetische Vokabellisten, Standard 1k/17k/200k Einträge):
+  parse      load_vocab (Parser + Dublettenbereinigung)
+  reverse    build_reverse
+  index      build_answer_index
+  cold/warm  load_vocab_cached ohne bzw. mit kompiliertem Cache
+  ask q/s    Fragen pro Sekunde durch ask() mit simuliertem Lerner (80 %)
+  grade      Latenz einer Bewertung (norm + Mengen-Lookup), p50/p99 in µs
+dazu die Tippfehler-Suche (FuzzyMatcher.match/suggest, p50/p99 in µs) über
+vokabeln.txt mit Eingaben aus 0-3 zufälligen Änderungen einer Normalform
+und für den Mathetrainer Aufgaben pro Sekunde durch shell_session().
+Mit Display zusätzlich die GUI: Kosten pro Größenänderung (on_resize samt
+Neu-Layout) beim Ziehen vom Vollbild auf 900x650 und zurück.
+
+Aufruf:
+  python3 benchmark.py                       # alle Größen
+  python3 benchmark.py --sizes 1000,17000    # Auswahl
+  python3 benchmark.py --json bench.json     # Ergebnisse zusätzlich als JSON
+  python3 benchmark.py --resize 0            # ohne GUI-Messung
+  python3 benchmark.py --fuzzy 0             # ohne Tippfehler-Suche
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from typing import Callable, Dict, List, Optional
+
+import headless
+
+_LETTERS = "abcdefghijklmnopqrstuvwxyzäöüß"
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_LETTERS) for _ in range(rng.randint(4, 12)))
+
+def write_synthetic_vocab(path: str, n_entries: int, seed: int = 0) -> None:
+    """Schreibt eine Liste im Format von vokabeln.txt mit 1–5 Übersetzungen pro Eintrag."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("vokabeln = {\n")
+        for i in range(n_entries):
+            de = [_word(rng) for _ in range(rng.randint(1, 5))]
+            if rng.random() < 0.2:
+                de.append(de[0].upper() + ":")   # Dublette mit Satzzeichen-Rest
+            sep = ",\n" if i < n_entries - 1 else "\n"
+            f.write(f"    {json.dumps(f'{_word(rng)}{i}')}: {json.dumps(de, ensure_ascii=False)}{sep}")
+        f.write("}\n")
+
+def _timed(fn: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+def _percentile(sorted_vals: List[float], p: float) -> float:
+    return sorted_vals[min(len(sorted_vals) - 1, int(p * len(sorted_vals)))]
+
+def bench_vocab(n_entries: int, questions: int, tmp: str) -> Dict[str, float]:
+    en = headless.load_vocab_trainer()
+    path = os.path.join(tmp, f"vokabeln_{n_entries}.txt")
+    write_synthetic_vocab(path, n_entries)
+    res: Dict[str, float] = {"entries": n_entries}
+
+    t0 = time.perf_counter(); vok = en.load_vocab(path); res["parse_s"] = time.perf_counter() - t0
+    t0 = time.perf_counter(); rev = en.build_reverse(vok); res["reverse_s"] = time.perf_counter() - t0
+    t0 = time.perf_counter(); answers = en.build_answer_index(vok, rev); res["index_s"] = time.perf_counter() - t0
+    res["cold_s"] = _timed(lambda: en.load_vocab_cached(path))
+    res["warm_s"] = _timed(lambda: en.load_vocab_cached(path))
+
+    learner = headless.SimulatedLearner(0.8, seed=1)
+    (_, total), secs = headless.run_session(en.ask, vok, rev, 3, questions, answers,
+                                            read_answer=learner, seed=1)
+    res["ask_qps"] = total / secs
+
+    rng = random.Random(2)
+    items = list(vok.items())
+    samples = []
+    for _ in range(min(questions, 20000)):
+        k, de_list = rng.choice(items)
+        user = rng.choice(de_list) if rng.random() < 0.8 else _word(rng)
+        samples.append((k, " " + user.upper() + " "))
+    en.norm.cache_clear()
+    lat = []
+    by_en, norm, clock = answers.by_en, en.norm, time.perf_counter
+    for k, user in samples:
+        t0 = clock()
+        norm(user) in by_en[k]
+        lat.append(clock() - t0)
+    lat.sort()
+    res["grade_p50_us"] = _percentile(lat, 0.50) * 1e6
+    res["grade_p99_us"] = _percentile(lat, 0.99) * 1e6
+    return res
+
+def _typo(word: str, rng: random.Random) -> str:
+    chars = list(word)
+    for _ in range(rng.randint(0, 3)):
+        i = rng.randrange(len(chars) + 1)
+        edit = rng.randrange(3)
+        if edit == 0 or not chars:
+            chars.insert(i, rng.choice(_LETTERS))
+        elif i < len(chars):
+            if edit == 1:
+                del chars[i]
+            else:
+                chars[i] = rng.choice(_LETTERS)
+    return "".join(chars)
+
+def bench_fuzzy(src: str, queries: int, max_dist: int = 2) -> Optional[Dict[str, float]]:
+    """Latenz von match() und suggest() über einer echten Liste; None, wenn sie fehlt."""
+    if not os.path.exists(src):
+        return None
+    en = headless.load_vocab_trainer()
+    loaded = en.load_vocab_cached(src)
+    t0 = time.perf_counter()
+    fuzzy = en.FuzzyMatcher(loaded.rev, max_dist)
+    res: Dict[str, float] = {"forms": len(fuzzy.words), "build_s": time.perf_counter() - t0}
+    rng = random.Random(3)
+    forms = sorted(fuzzy.words)
+    samples = []
+    for _ in range(queries):
+        en_word = rng.choice(list(loaded.vok)) if rng.random() < 0.5 else None
+        valid = loaded.answers.by_en[en_word] if en_word else frozenset([rng.choice(forms)])
+        samples.append((_typo(rng.choice(sorted(valid)), rng), valid))
+    for name in ("match", "suggest"):
+        lat = []
+        for user, valid in samples:
+            t0 = time.perf_counter()
+            fuzzy.match(user, valid) if name == "match" else fuzzy.suggest(user)
+            lat.append(time.perf_counter() - t0)
+        lat.sort()
+        res[f"{name}_p50_us"] = _percentile(lat, 0.50) * 1e6
+        res[f"{name}_p99_us"] = _percentile(lat, 0.99) * 1e6
+    return res
+
+def bench_math(tasks: int) -> Dict[str, float]:
+    ma = headless.load_math_trainer()
+    learner = headless.SimulatedLearner(0.8, seed=1)
+    (_, _, total), secs = headless.run_session(
+        ma.shell_session, list(ma.OPS), "anzahl", tasks, read_answer=learner, seed=1,
+    )
+    return {"tasks": total, "tasks_per_s": total / secs}
+
+def bench_resize(events: int) -> Optional[Dict[str, float]]:
+    """Größenänderungen im Vollbild-Fenster; None ohne Tkinter oder Display."""
+    ma = headless.load_math_trainer()
+    if not ma.load_tk():
+        return None
+    try:
+        root = ma.tk.Tk()
+    except ma.tk.TclError:
+        return None
+    try:
+        root.attributes("-fullscreen", True)
+        app = ma.TrainerGUI(root)
+        root.update()
+        sw, sh = root.winfo_width(), root.winfo_height()
+        # ein Ereignis pro Schritt: Vollbild -> 900x650 -> Vollbild
+        half = max(1, events // 2)
+        path = [(sw + (900 - sw) * i // half, sh + (650 - sh) * i // half) for i in range(half + 1)]
+        sizes = path + path[::-1]
+        changed = 0
+        t0 = time.perf_counter()
+        for w, h in sizes:
+            changed += bool(app.on_resize(w, h))
+            root.update_idletasks()
+        elapsed = time.perf_counter() - t0
+        return {"screen": f"{sw}x{sh}", "events": len(sizes), "font_changes": changed,
+                "us_per_event": elapsed / len(sizes) * 1e6}
+    finally:
+        root.destroy()
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark der Lerntrainer (headless)")
+    ap.add_argument("--sizes", default="1000,17000,200000", help="Listengrößen, kommagetrennt")
+    ap.add_argument("--questions", type=int, default=20000, help="Fragen pro ask()-Lauf")
+    ap.add_argument("--json", metavar="PFAD", help="Ergebnisse zusätzlich als JSON speichern")
+    ap.add_argument("--resize", type=int, default=2000, help="Größenänderungen im GUI-Test (0 = aus)")
+    ap.add_argument("--fuzzy", type=int, default=2000, help="Eingaben für die Tippfehler-Suche (0 = aus)")
+    args = ap.parse_args(argv)
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    results: Dict[str, object] = {"python": sys.version.split()[0], "vocab": [], "fuzzy": None,
+                                  "math": None, "resize": None}
+    cols = ("entries", "parse_s", "reverse_s", "index_s", "cold_s", "warm_s",
+            "ask_qps", "grade_p50_us", "grade_p99_us")
+    print(" ".join(f"{c:>12}" for c in cols))
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            r = bench_vocab(n, args.questions, tmp)
+            results["vocab"].append(r)
+            print(" ".join(f"{r[c]:>12.0f}" if c in ("entries", "ask_qps") else f"{r[c]:>12.4f}" for c in cols))
+    if args.fuzzy > 0:
+        fz = bench_fuzzy(os.path.join(headless.HERE, "vokabeln.txt"), args.fuzzy)
+        results["fuzzy"] = fz
+        if fz is None:
+            print("\nTippfehler-Suche: übersprungen (vokabeln.txt fehlt)")
+        else:
+            print(f"\nTippfehler-Suche ({fz['forms']:.0f} Formen, Aufbau {fz['build_s']:.3f} s): "
+                  f"match p50 {fz['match_p50_us']:.0f} µs, p99 {fz['match_p99_us']:.0f} µs; "
+                  f"suggest p50 {fz['suggest_p50_us']:.0f} µs, p99 {fz['suggest_p99_us']:.0f} µs")
+    m = bench_math(args.questions)
+    results["math"] = m
+    print(f"\nMathe: {m['tasks']} Aufgaben, {m['tasks_per_s']:.0f} Aufgaben/s")
+    if args.resize > 0:
+        r = bench_resize(args.resize)
+        results["resize"] = r
+        if r is None:
+            print("GUI-Resize: übersprungen (kein Tkinter oder Display)")
+        else:
+            print(f"GUI-Resize ({r['screen']}): {r['events']} Ereignisse, {r['font_changes']} mit "
+                  f"Schriftänderung, {r['us_per_event']:.0f} µs/Ereignis")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Headless-Sitzungen für Vokabel- und Mathetrainer.
+
+Beide Trainer lesen Antworten über read_answer(prompt, lösung) statt direkt
+über input(). Hier liegen austauschbare Antwortquellen dafür:
+
+  ScriptedAnswers   feste Liste von Eingaben
+  SimulatedLearner  antwortet mit gegebener Trefferquote richtig
+  ReplayAnswers     spielt ein mit RecordingAnswers aufgezeichnetes Protokoll ab
+
+run_session() ruft eine Sitzungsfunktion (ask, shell_session) ohne
+Bildschirmausgabe auf und misst die Dauer. Die Skripte haben Leerzeichen im
+Namen; load_vocab_trainer()/load_math_trainer() laden sie als Module.
+
+Beispiel:
+    en = load_vocab_trainer()
+    vok, rev, answers = en.load_vocab_cached("vokabeln.txt")[:3]
+    (correct, total), secs = run_session(
+        en.ask, vok, rev, 3, 100, answers,
+        read_answer=SimulatedLearner(0.8, seed=1), seed=1,
+    )
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import random
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# ---------- Trainer laden ----------
+
+# Laden der Skripte (Leerzeichen im Namen) übernimmt trainer_core
+from trainer_core import HERE, VOCAB_SCRIPT, MATH_SCRIPT, load_vocab_trainer, load_math_trainer
+
+# ---------- Antwortquellen ----------
+
+class ScriptedAnswers:
+    """Gibt die Eingaben der Reihe nach zurück; danach `default`."""
+
+    def __init__(self, answers: Iterable[str], default: str = ""):
+        self._it = iter(answers)
+        self.default = default
+
+    def __call__(self, prompt: str, solution: str) -> str:
+        return next(self._it, self.default)
+
+class SimulatedLearner:
+    """Antwortet mit Wahrscheinlichkeit `accuracy` richtig, sonst mit `wrong`."""
+
+    def __init__(self, accuracy: float, seed: Optional[int] = None, wrong: str = "?"):
+        if not 0.0 <= accuracy <= 1.0:
+            raise ValueError("accuracy muss zwischen 0 und 1 liegen")
+        self.accuracy = accuracy
+        self.wrong = wrong
+        self._rng = random.Random(seed)
+
+    def __call__(self, prompt: str, solution: str) -> str:
+        return solution if self._rng.random() < self.accuracy else self.wrong
+
+class RecordingAnswers:
+    """Reicht an eine andere Quelle weiter und schreibt jede Eingabe als JSON-Zeile mit."""
+
+    def __init__(self, inner: Callable[[str, str], str], path: str):
+        self.inner = inner
+        self._f = open(path, "a", encoding="utf-8")
+
+    def __call__(self, prompt: str, solution: str) -> str:
+        answer = self.inner(prompt, solution)
+        self._f.write(json.dumps({"prompt": prompt, "answer": answer}, ensure_ascii=False) + "\n")
+        return answer
+
+    def close(self) -> None:
+        self._f.close()
+
+class ReplayAnswers:
+    """
+    Spielt ein Protokoll von RecordingAnswers ab. Mit gleichem seed in
+    run_session() kommen die Fragen in derselben Reihenfolge; mit strict=True
+    wird jede Abweichung des Prompts als Fehler gemeldet.
+    """
+
+    def __init__(self, path: str, strict: bool = False):
+        with open(path, "r", encoding="utf-8") as f:
+            self.records: List[Dict[str, str]] = [json.loads(line) for line in f if line.strip()]
+        self.strict = strict
+        self._pos = 0
+
+    def __call__(self, prompt: str, solution: str) -> str:
+        if self._pos >= len(self.records):
+            return ""
+        rec = self.records[self._pos]
+        self._pos += 1
+        if self.strict and rec["prompt"] != prompt:
+            raise ValueError(f"Protokoll weicht ab: erwartet {rec['prompt']!r}, gefragt {prompt!r}")
+        return rec["answer"]
+
+# ---------- Sitzungen ----------
+
+def run_session(session: Callable[..., Any], *args: Any, seed: Optional[int] = None,
+                quiet: bool = True, **kwargs: Any) -> Tuple[Any, float]:
+    """
+    Ruft `session(*args, **kwargs)` auf, z.B. ask(...) oder shell_session(...),
+    mit festem Zufalls-seed und ohne Ausgabe. Liefert (ergebnis, sekunden).
+    """
+    if seed is not None:
+        random.seed(seed)
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with redirect_stdout(devnull if quiet else sys.stdout):
+            t0 = time.perf_counter()
+            result = session(*args, **kwargs)
+            elapsed = time.perf_counter() - t0
+    return result, elapsed
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Eingebautes Profiling für Vokabel- und Mathetrainer.
+
+Einschalten mit --profile bzw. --profile=VERZEICHNIS oder über
+LERNTRAINER_PROFILE=1 (bzw. =VERZEICHNIS); Standard ist ./lerntrainer-profil.
+Die Trainer laden dieses Modul nur dann, sonst kostet es nichts.
+
+cProfile läuft getrennt pro Phase ("laden": Liste bzw. Module laden,
+"sitzung": Menü, Fragen, Tk-Callbacks). Beim Beenden entstehen pro Phase
+  <trainer>-<phase>.prof   für pstats/snakeviz
+  <trainer>-<phase>.txt    die teuersten Funktionen nach kumulierter Zeit
+und <trainer>-zaehler.json mit den Phasendauern und den Zählern des
+Trainers (counters(): norm-Aufrufe, Cache-Treffer, erzeugte Aufgaben,
+Neuaufbau von Widgets, ...).
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+from typing import Dict, Optional
+
+ENV = "LERNTRAINER_PROFILE"
+DEFAULT_DIR = "lerntrainer-profil"
+
+class Profiler:
+    """Ein cProfile pro Phase; es läuft immer höchstens eines (enter() wechselt)."""
+
+    def __init__(self, trainer: str, setting: str = "1"):
+        self.trainer = trainer
+        self.out_dir = DEFAULT_DIR if setting in ("", "1") else setting
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._seconds: Dict[str, float] = {}
+        self._current: Optional[str] = None
+        self._since = 0.0
+
+    def enter(self, phase: str) -> None:
+        """Beendet die laufende Phase und misst ab jetzt `phase` (auch erneut)."""
+        self._stop()
+        prof = self._profiles.get(phase)
+        if prof is None:
+            prof = self._profiles[phase] = cProfile.Profile()
+            self._seconds[phase] = 0.0
+        self._current = phase
+        self._since = time.perf_counter()
+        prof.enable()
+
+    def _stop(self) -> None:
+        phase = self._current
+        if phase is None:
+            return
+        self._profiles[phase].disable()
+        self._seconds[phase] += time.perf_counter() - self._since
+        self._current = None
+
+    def finish(self, counters: Dict[str, int], top: int = 25) -> str:
+        """Schreibt Profile und Zähler; liefert den Ausgabeordner."""
+        self._stop()
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, self.trainer)
+        for phase, prof in self._profiles.items():
+            prof.dump_stats(f"{base}-{phase}.prof")
+            with open(f"{base}-{phase}.txt", "w", encoding="utf-8") as f:
+                f.write(f"{self.trainer}, Phase {phase}: {self._seconds[phase]:.3f} s\n")
+                pstats.Stats(prof, stream=f).strip_dirs().sort_stats("cumulative").print_stats(top)
+        with open(f"{base}-zaehler.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "trainer": self.trainer,
+                "ts": time.time(),
+                "python": sys.version.split()[0],
+                "phasen_s": {phase: round(s, 6) for phase, s in self._seconds.items()},
+                "zaehler": counters,
+            }, f, ensure_ascii=False, indent=2)
+        return self.out_dir
+
+    def report(self) -> str:
+        return ", ".join(f"{phase} {s:.2f} s" for phase, s in self._seconds.items())
+
+def start(trainer: str, setting: Optional[str]) -> Optional[Profiler]:
+    """Profiler für setting (aus --profile oder ENV), None wenn nicht gewünscht."""
+    if setting is None or setting == "0":
+        return None
+    return Profiler(trainer, setting)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gemeinsamer Lernverlauf für Vokabel- und Mathetrainer (SQLite, WAL).
+
+Jede Antwort wird mit Trainer, Karte, Richtung, Ergebnis und Antwortzeit
+gespeichert. Schreiben geschieht gepuffert: record() hängt nur an eine Liste
+an, flush() schreibt alles in einer Transaktion (am Rundenende oder alle
+`batch_size` Antworten). So kostet die Datenbank während einer Frage keine I/O.
+Daneben hält die Tabelle state kleine Zustände pro Trainer, etwa die Position
+im gemischten Vokabeldeck (load_state/save_state).
+
+Datei: $LERNTRAINER_DB oder ~/.local/share/lerntrainer/verlauf.sqlite3
+(bzw. $XDG_DATA_HOME/lerntrainer/verlauf.sqlite3).
+"""
+
+from __future__ import annotations
+import os
+import time
+import sqlite3
+from typing import List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    id          INTEGER PRIMARY KEY,
+    ts          REAL    NOT NULL,
+    trainer     TEXT    NOT NULL,
+    card        TEXT    NOT NULL,
+    direction   TEXT    NOT NULL,
+    correct     INTEGER NOT NULL,
+    response_ms INTEGER
+);
+CREATE INDEX IF NOT EXISTS answers_card ON answers (trainer, card, correct);
+CREATE INDEX IF NOT EXISTS answers_ts   ON answers (trainer, ts, correct);
+CREATE TABLE IF NOT EXISTS state (
+    trainer     TEXT    NOT NULL,
+    key         TEXT    NOT NULL,
+    value       TEXT    NOT NULL,
+    PRIMARY KEY (trainer, key)
+);
+"""
+
+def default_path() -> str:
+    env = os.environ.get("LERNTRAINER_DB")
+    if env:
+        return env
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "lerntrainer", "verlauf.sqlite3")
+
+class ProgressStore:
+    """
+    Gepufferter Schreibzugriff auf den Lernverlauf.
+
+    Verwendung:
+        with ProgressStore() as store:
+            store.record("vokabeln", "habit", "en-de", True, 2.4)
+            ...
+            store.flush()   # z.B. am Rundenende
+    """
+
+    def __init__(self, path: Optional[str] = None, batch_size: int = 50):
+        self.path = path or default_path()
+        self.batch_size = batch_size
+        self._pending: List[Tuple[float, str, str, str, int, Optional[int]]] = []
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: ein Absturz verliert höchstens den letzten Batch, die Datei bleibt konsistent
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def record(self, trainer: str, card: str, direction: str, correct: bool,
+               response_s: Optional[float] = None) -> None:
+        ms = None if response_s is None else int(response_s * 1000)
+        self._pending.append((time.time(), trainer, card, direction, int(bool(correct)), ms))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO answers (ts, trainer, card, direction, correct, response_ms) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def load_state(self, trainer: str, key: str) -> Optional[str]:
+        """Gespeicherter Zustand eines Trainers, z.B. die Position im Vokabeldeck."""
+        row = self._db.execute(
+            "SELECT value FROM state WHERE trainer = ? AND key = ?", (trainer, key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def save_state(self, trainer: str, key: str, value: str) -> None:
+        # Einzelne Zeile pro Runde, daher ohne Puffer
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO state (trainer, key, value) VALUES (?, ?, ?)",
+                (trainer, key, value),
+            )
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._db.close()
+
+    def __enter__(self) -> "ProgressStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---------- Abfragen ----------
+
+    def weakest(self, trainer: str, limit: int = 10, min_answers: int = 2) -> List[Tuple[str, int, int]]:
+        """Karten mit der schlechtesten Trefferquote: [(karte, richtig, gesamt), ...]."""
+        self.flush()
+        return self._db.execute(
+            "SELECT card, SUM(correct) AS ok, COUNT(*) AS n FROM answers "
+            "WHERE trainer = ? GROUP BY card HAVING n >= ? "
+            "ORDER BY CAST(ok AS REAL) / n, n DESC LIMIT ?",
+            (trainer, min_answers, limit),
+        ).fetchall()
+
+    def daily_accuracy(self, trainer: str, days: int = 14) -> List[Tuple[str, int, int]]:
+        """Trefferquote pro Kalendertag (lokale Zeit): [(datum, richtig, gesamt), ...]."""
+        self.flush()
+        since = time.time() - days * 86400
+        return self._db.execute(
+            "SELECT date(ts, 'unixepoch', 'localtime') AS day, SUM(correct), COUNT(*) FROM answers "
+            "WHERE trainer = ? AND ts >= ? GROUP BY day ORDER BY day",
+            (trainer, since),
+        ).fetchall()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Quiz-Server für ganze Klassen: lädt Vokabelliste und Mathe-Konfiguration
+einmal und bedient beliebig viele gleichzeitige Sitzungen (asyncio, ein Thread).
+
+Zeilenprotokoll (UTF-8, eine Nachricht pro Zeile), z.B. mit `nc localhost 8765`:
+
+  Client                         Server
+                                 HALLO lerntrainer
+  VOKABELN <modus 1-3> <anzahl>
+  MATHE <ops, z.B. +-*/> <anzahl>
+                                 FRAGE <aufgabe>
+  <antwort>
+                                 RICHTIG | FALSCH <lösung>
+                                 ... bis ENDE <richtig>/<gesamt> NOTE <note>
+  QUIT
+
+Jede Sitzung ist eine trainer_core.Session über den Aufgabentypen der
+Trainer (VocabTasks, MathTasks); bewertet wird also genau wie dort.
+
+Aufruf:
+  python3 quiz_server.py [--host 127.0.0.1] [--port 8765] [--vokabeln QUELLE]
+  python3 quiz_server.py --loadtest 300      # Lasttest mit simulierten Clients
+"""
+
+from __future__ import annotations
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+from typing import List, Optional
+
+import headless
+import trainer_core as core
+
+en = headless.load_vocab_trainer()
+ma = headless.load_math_trainer()
+
+class Shared:
+    """Einmal geladene, von allen Sitzungen nur gelesene Daten."""
+
+    def __init__(self, src: str):
+        loaded = en.load_vocab_cached(src)
+        self.vok, self.rev, self.answers = loaded.vok, loaded.rev, loaded.answers
+        self.keys = list(self.vok)
+
+def _start_session(shared: Shared, line: str) -> Optional[core.Session]:
+    parts = line.split()
+    cmd = parts[0].upper() if parts else ""
+    try:
+        n = int(parts[2]) if len(parts) > 2 else 20
+    except ValueError:
+        return None
+    if n <= 0:
+        return None
+    if cmd == "VOKABELN" and len(parts) >= 2 and parts[1] in ("1", "2", "3"):
+        # ohne Deck: zufällig mit Zurücklegen, alle Sitzungen teilen sich keys
+        plugin = en.VocabTasks(shared.vok, shared.rev, shared.answers, int(parts[1]), keys=shared.keys)
+        return core.Session(plugin, n)
+    if cmd == "MATHE" and len(parts) >= 2:
+        ops = [op for op in parts[1] if op in ma.OPS]
+        if ops:
+            return core.Session(ma.MathTasks(ma.TaskPool(ops, block=min(n, 1024))), n)
+    return None
+
+async def handle_client(shared: Shared, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    def send(msg: str) -> None:
+        writer.write((msg + "\n").encode("utf-8"))
+
+    send("HALLO lerntrainer")
+    try:
+        while True:
+            await writer.drain()
+            raw = await reader.readline()
+            if not raw:
+                break
+            line = raw.decode("utf-8", "replace").strip()
+            if line.upper() == "QUIT":
+                break
+            session = _start_session(shared, line)
+            if session is None:
+                send("FEHLER erwartet: VOKABELN <1-3> <anzahl> | MATHE <ops> <anzahl> | QUIT")
+                continue
+            while True:
+                prompt = session.next_question()
+                if prompt is None:
+                    send(f"ENDE {session.summary()}")
+                    break
+                send(f"FRAGE {prompt.rstrip(' :')}")
+                await writer.drain()
+                raw = await reader.readline()
+                if not raw:
+                    return
+                if session.answer(raw.decode("utf-8", "replace").strip())[0]:
+                    send("RICHTIG")
+                else:
+                    send(f"FALSCH {session.solution}")
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def serve(shared: Shared, host: str, port: int) -> asyncio.AbstractServer:
+    # Großer Backlog: eine ganze Klasse verbindet sich oft im selben Moment
+    return await asyncio.start_server(lambda r, w: handle_client(shared, r, w), host, port, backlog=1024)
+
+# ---------- Lasttest ----------
+
+async def _simulated_client(host: str, port: int, cmd: str, accuracy: float,
+                            rng: random.Random, latencies: List[float]) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    answered = 0
+    await reader.readline()   # HALLO
+    writer.write((cmd + "\n").encode("utf-8"))
+    while True:
+        line = (await reader.readline()).decode("utf-8").rstrip("\n")
+        if not line.startswith("FRAGE "):
+            break
+        task = line[6:]
+        answer = "?"
+        if task.endswith(" =") and rng.random() < accuracy:
+            a, op, b, _ = task.split(" ")
+            answer = ma.format_result_for_display(ma.OPS[op]["func"], int(a), int(b), op)
+        t0 = time.perf_counter()
+        writer.write((answer + "\n").encode("utf-8"))
+        await reader.readline()   # RICHTIG/FALSCH
+        latencies.append(time.perf_counter() - t0)
+        answered += 1
+    writer.write(b"QUIT\n")
+    await writer.drain()
+    writer.close()
+    return answered
+
+async def loadtest(shared: Shared, clients: int, questions: int) -> None:
+    server = await serve(shared, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    rng = random.Random(1)
+    latencies: List[float] = []
+    cmds = [f"MATHE +-*/ {questions}" if i % 2 else f"VOKABELN 3 {questions}" for i in range(clients)]
+    t0 = time.perf_counter()
+    counts = await asyncio.gather(*(
+        _simulated_client(host, port, cmd, 0.8, rng, latencies) for cmd in cmds
+    ))
+    elapsed = time.perf_counter() - t0
+    server.close()
+    await server.wait_closed()
+    latencies.sort()
+    total = sum(counts)
+    p = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    print(f"{clients} Clients, {total} Antworten in {elapsed:.2f}s ({total / elapsed:.0f}/s)")
+    print(f"Antwortlatenz p50 {p(0.5):.2f} ms, p99 {p(0.99):.2f} ms")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Quiz-Server für Vokabel- und Mathetrainer")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    local = os.path.join(headless.HERE, "vokabeln.txt")
+    ap.add_argument("--vokabeln", default=local if os.path.exists(local) else en.DEFAULT_URL,
+                    help="Datei oder URL der Vokabelliste")
+    ap.add_argument("--loadtest", type=int, metavar="CLIENTS", help="Lasttest mit simulierten Clients")
+    ap.add_argument("--questions", type=int, default=20, help="Fragen pro Client im Lasttest")
+    args = ap.parse_args(argv)
+
+    shared = Shared(args.vokabeln)
+    if args.loadtest:
+        asyncio.run(loadtest(shared, args.loadtest, args.questions))
+        return 0
+
+    async def run() -> None:
+        server = await serve(shared, args.host, args.port)
+        print(f"{len(shared.vok)} Vokabeln geladen, Server läuft auf {args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\nBeendet.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
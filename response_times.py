@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Antwortzeiten für Vokabel- und Mathetrainer.
+
+Die Trainer messen jede Eingabe mit time.perf_counter und legen
+(schlüssel, sekunden) in einen vorab angelegten Ringpuffer; im Frageloop
+kostet das zwei Zuweisungen. Erst am Rundenende werden pro Schlüssel (Karte
+bzw. Operator) p50/p90/p99 berechnet.
+
+Export: LERNTRAINER_ZEITEN=pfad.csv oder pfad.json hängt nach jeder Runde die
+Messwerte an (CSV: eine Zeile pro Antwort, JSON: ein Objekt pro Runde und Zeile).
+"""
+
+from __future__ import annotations
+import os
+import time
+import array
+from typing import Dict, Hashable, List, Optional, Tuple
+
+ENV_EXPORT = "LERNTRAINER_ZEITEN"
+
+def percentile(sorted_vals: List[float], p: float) -> float:
+    """Nächster Rang auf einer aufsteigend sortierten Liste."""
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(p * len(sorted_vals)))]
+
+class ResponseTimes:
+    """Ringpuffer fester Größe; ältere Werte werden überschrieben."""
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self._secs = array.array("d", bytes(8 * capacity))
+        self._keys: List[Optional[Hashable]] = [None] * capacity
+        self._pos = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, key: Hashable, seconds: float) -> None:
+        i = self._pos
+        self._secs[i] = seconds
+        self._keys[i] = key
+        self._pos = i + 1 if i + 1 < self.capacity else 0
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self) -> None:
+        self._pos = 0
+        self._count = 0
+
+    def samples(self) -> List[Tuple[Hashable, float]]:
+        """Messwerte in Aufnahmereihenfolge."""
+        start = (self._pos - self._count) % self.capacity
+        idx = [(start + k) % self.capacity for k in range(self._count)]
+        return [(self._keys[i], self._secs[i]) for i in idx]
+
+    def report(self) -> Dict[Hashable, Dict[str, float]]:
+        """{schlüssel: {n, p50, p90, p99}} plus Gesamtwerte unter None."""
+        groups: Dict[Hashable, List[float]] = {}
+        everything: List[float] = []
+        for key, secs in self.samples():
+            groups.setdefault(key, []).append(secs)
+            everything.append(secs)
+        out: Dict[Hashable, Dict[str, float]] = {}
+        for key, vals in list(groups.items()) + [(None, everything)]:
+            vals.sort()
+            out[key] = {
+                "n": len(vals),
+                "p50": percentile(vals, 0.50),
+                "p90": percentile(vals, 0.90),
+                "p99": percentile(vals, 0.99),
+            }
+        return out
+
+    def format_report(self, label: str, top: int = 5) -> str:
+        """Kurzfassung: Gesamtwerte und die `top` langsamsten Schlüssel nach Median."""
+        rep = self.report()
+        total = rep.pop(None)
+        if not total["n"]:
+            return ""
+        lines = [f"Antwortzeit: p50 {total['p50']:.1f}s  p90 {total['p90']:.1f}s  p99 {total['p99']:.1f}s"]
+        slowest = sorted(rep.items(), key=lambda kv: kv[1]["p50"], reverse=True)[:top]
+        if slowest:
+            lines.append(f"Langsamste {label}:")
+            for key, st in slowest:
+                lines.append(f"  {key}: p50 {st['p50']:.1f}s  p90 {st['p90']:.1f}s  (n={st['n']})")
+        return "\n".join(lines)
+
+    def export(self, path: str, trainer: str) -> None:
+        """Hängt die Messwerte dieser Runde an `path` an (.csv, sonst JSON-Zeilen)."""
+        import csv, json   # nur beim Export gebraucht, hält den Start der Trainer schlank
+        ts = time.time()
+        samples = self.samples()
+        if path.lower().endswith(".csv"):
+            new = not os.path.exists(path)
+            with open(path, "a", newline="", encoding="utf-8") as f:
+                w = csv.writer(f)
+                if new:
+                    w.writerow(["ts", "trainer", "key", "seconds"])
+                w.writerows((f"{ts:.3f}", trainer, key, f"{secs:.4f}") for key, secs in samples)
+            return
+        report = {str(k) if k is not None else "gesamt": v for k, v in self.report().items()}
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"ts": ts, "trainer": trainer, "report": report,
+                                "samples": [[str(k), s] for k, s in samples]}, ensure_ascii=False) + "\n")
+
+    def finish_round(self, trainer: str, label: str) -> str:
+        """Export (falls konfiguriert) und Bericht am Rundenende."""
+        path = os.environ.get(ENV_EXPORT)
+        if path and self._count:
+            try:
+                self.export(path, trainer)
+            except OSError as e:
+                print(f"Antwortzeiten konnten nicht gespeichert werden: {e}")
+        return self.format_report(label)
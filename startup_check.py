@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Startzeit-Check für beide Trainer auf Basis von `python -X importtime`.
+
+Jedes Skript wird in einem frischen Interpreter geladen, so wie der
+Shell-Modus startet (Modul ausführen, main() nicht aufrufen). Gezählt werden
+nur die Importe, die das Skript selbst auslöst, nicht der Interpreterstart.
+Geprüft wird:
+  - Summe der Importzeiten unter dem Budget (bester von --runs Läufen)
+  - keine GUI-, NumPy- oder Netzwerk-Module (die werden erst bei Bedarf geladen)
+
+Exit-Code 1, wenn ein Trainer das Budget reißt oder ein verbotenes Modul lädt.
+
+Aufruf:
+  python3 startup_check.py                    # Standardbudget 40 ms
+  python3 startup_check.py --budget-ms 60 --runs 5
+"""
+
+from __future__ import annotations
+import os
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+import headless
+
+FORBIDDEN = ("tkinter", "_tkinter", "numpy", "ssl", "urllib.request", "http.client")
+_MARKER = "--lerntrainer-start--"
+
+_CHILD = f"""
+import sys, time, importlib.util
+sys.stderr.write({_MARKER!r} + "\\n"); sys.stderr.flush()
+t0 = time.perf_counter()
+spec = importlib.util.spec_from_file_location("trainer", sys.argv[1])
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+print(time.perf_counter() - t0)
+"""
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, int]]:
+    """(summe in s, {modul: kumulative µs}) für alle Importe nach der Markierung."""
+    lines = stderr.splitlines()
+    try:
+        lines = lines[lines.index(_MARKER) + 1:]
+    except ValueError:
+        pass
+    total_us = 0
+    modules: Dict[str, int] = {}
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        try:
+            us = int(cumulative)
+        except ValueError:
+            continue   # Kopfzeile
+        modules[name.strip()] = us
+        if not name.startswith("  "):   # oberste Ebene: enthält die Unterimporte schon
+            total_us += us
+    return total_us / 1e6, modules
+
+def measure(script: str) -> Tuple[float, float, Dict[str, int]]:
+    """Ein Lauf: (importzeit s, ladezeit s, module)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD, os.path.join(headless.HERE, script)],
+        cwd=headless.HERE, capture_output=True, text=True, check=True,
+    )
+    imports, modules = parse_importtime(proc.stderr)
+    return imports, float(proc.stdout.strip().splitlines()[-1]), modules
+
+def check(script: str, budget_s: float, runs: int) -> List[str]:
+    best: Optional[Tuple[float, float, Dict[str, int]]] = None
+    for _ in range(runs):
+        r = measure(script)
+        if best is None or r[0] < best[0]:
+            best = r
+    imports, load, modules = best
+    problems = [f"lädt {name} beim Start" for name in FORBIDDEN if name in modules]
+    if imports > budget_s:
+        problems.append(f"Importe {imports * 1000:.1f} ms > Budget {budget_s * 1000:.0f} ms")
+    slowest = sorted(modules.items(), key=lambda kv: kv[1], reverse=True)[:3]
+    print(f"{script}: Importe {imports * 1000:.1f} ms, Laden gesamt {load * 1000:.1f} ms "
+          f"(langsamste: {', '.join(f'{n} {us / 1000:.1f} ms' for n, us in slowest) or '-'})")
+    return problems
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Startzeit-Budget der Lerntrainer prüfen")
+    ap.add_argument("--budget-ms", type=float, default=40.0, help="erlaubte Importzeit pro Trainer")
+    ap.add_argument("--runs", type=int, default=3, help="Läufe pro Trainer, der beste zählt")
+    args = ap.parse_args(argv)
+
+    failed = False
+    for script in (headless.VOCAB_SCRIPT, headless.MATH_SCRIPT):
+        for problem in check(script, args.budget_ms / 1000, max(1, args.runs)):
+            print(f"  FEHLER: {problem}")
+            failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
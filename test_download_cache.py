@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Download-Cache (fetch_cached) gegen einen lokalen http.server statt GitHub:
+gzip, Revalidierung per ETag (304), nicht erreichbarer Server und Offline-Modus.
+
+Aufruf: python3 -m pytest -q test_download_cache.py
+"""
+
+from __future__ import annotations
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import headless
+
+en = headless.load_vocab_trainer()
+
+BODY = 'vokabeln = {"dog": ["Hund"], "cat": ["Katze"]}\n'.encode("utf-8")
+ETAG = '"v1"'
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = BODY
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        if self.server.gzip and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.requests = []
+    srv.gzip = True
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    srv.url = f"http://127.0.0.1:{srv.server_address[1]}/vokabeln.txt"
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return tmp_path
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def test_gzip_body_is_stored_decompressed(server):
+    path = en.fetch_cached(server.url)
+    assert _read(path) == BODY
+    assert "gzip" in server.requests[0]["Accept-Encoding"]
+
+def test_etag_revalidation_reuses_copy(server):
+    first = en.fetch_cached(server.url)
+    second = en.fetch_cached(server.url)
+    assert first == second and _read(second) == BODY
+    assert len(server.requests) == 2
+    assert server.requests[1].get("If-None-Match") == ETAG
+
+def test_unreachable_server_falls_back_to_cache(server, capsys):
+    path = en.fetch_cached(server.url)
+    server.shutdown()
+    server.server_close()
+    assert en.fetch_cached(server.url) == path
+    assert "zwischengespeicherte Kopie" in capsys.readouterr().out
+
+def test_offline_hit_and_miss(server):
+    with pytest.raises(RuntimeError):
+        en.fetch_cached(server.url, offline=True)
+    assert server.requests == []
+    path = en.fetch_cached(server.url)
+    assert en.fetch_cached(server.url, offline=True) == path
+    assert len(server.requests) == 1
+
+def test_load_vocab_cached_from_url(server):
+    loaded = en.load_vocab_cached(server.url)
+    assert loaded.vok == {"dog": ("Hund",), "cat": ("Katze",)}
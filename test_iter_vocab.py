@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parser der Vokabellisten (iter_vocab/load_vocab): gleiche Ergebnisse wie das
+frühere exec() mit anschließender Bereinigung, auch für Werte, die keine
+Strings sind, und für verkettete String-Literale.
+
+Aufruf: python3 -m pytest -q test_iter_vocab.py
+"""
+
+from __future__ import annotations
+
+import pytest
+
+import headless
+
+en = headless.load_vocab_trainer()
+
+def _parse(text):
+    return dict(en.iter_vocab(text.splitlines(True)))
+
+def test_non_string_values_are_skipped():
+    text = '''vokabeln = {
+        "a": ["x", 1, None, 2.5, True, -3],
+        "b": None,
+        "c": 42,
+        "d": ("y", False,),
+        7: "sieben",
+        "e": [1, 2],
+    }
+    '''
+    assert _parse(text) == {"a": ["x"], "d": ["y"]}
+
+def test_adjacent_strings_are_concatenated():
+    text = '''vokabeln = {
+        "ice" "cream": ["Speise" 'eis', "Eis"
+                        "creme"],
+        "dog": "Hu" "nd",
+    }
+    '''
+    assert _parse(text) == {"icecream": ["Speiseeis", "Eiscreme"], "dog": ["Hund"]}
+
+def test_matches_exec_of_the_same_source():
+    text = 'vokabeln = {"a": ["x", 1, "y" "z"], "b": None, "c": " c ", 3: ["drei"]}\n'
+    ns = {}
+    exec(text, {}, ns)
+    expected = {}
+    for key, vals in ns["vokabeln"].items():
+        if not isinstance(key, str):
+            continue
+        vals = [vals] if isinstance(vals, str) else [v for v in vals if isinstance(v, str)] \
+            if isinstance(vals, (list, tuple)) else []
+        vals = [v.strip() for v in vals if v.strip()]
+        if vals:
+            expected[key.strip()] = vals
+    assert _parse(text) == expected
+
+def test_unknown_names_are_rejected():
+    with pytest.raises(ValueError):
+        _parse('vokabeln = {"a": [foo]}\n')
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Paralleles Laden mehrerer Listen (load_vocab_multi) mit mehreren Workern,
+auch wenn die Maschine nur eine CPU hat: os.cpu_count wird auf 4 gesetzt.
+
+Aufruf: python3 -m pytest -q test_load_multi.py
+"""
+
+from __future__ import annotations
+import os
+import multiprocessing
+
+import pytest
+
+import headless
+from benchmark import write_synthetic_vocab
+
+en = headless.load_vocab_trainer()
+
+@pytest.fixture
+def shards(tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    paths = []
+    for i in range(3):
+        path = str(tmp_path / f"thema{i}.txt")
+        write_synthetic_vocab(path, 300, seed=i)
+        paths.append(path)
+    return paths
+
+def _load(paths, tmp_path, monkeypatch, name, **kwargs):
+    # eigenes Cache-Verzeichnis pro Aufruf, sonst käme das zweite Deck aus dem Cache
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / name))
+    return en.load_vocab_multi(paths, **kwargs)
+
+def test_threads_match_sequential_merge(shards, tmp_path, monkeypatch):
+    loaded = _load(shards, tmp_path, monkeypatch, "threads", processes=False)
+    parts = [(en.topic_name(p), en.load_vocab(p)) for p in shards]
+    vok, _, topics = en.merge_vocabs(parts, "union")
+    assert loaded.vok == vok
+    assert loaded.topics == topics
+    assert len(loaded.topics) == 3
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="Worker starten nicht per fork")
+def test_processes_when_imported(shards, tmp_path, monkeypatch):
+    # als Modul geladen (nicht __main__): Worker müssen _parse_shard per Namen finden
+    assert en.__name__ != "__main__"
+    default = _load(shards, tmp_path, monkeypatch, "default")
+    forced = _load(shards, tmp_path, monkeypatch, "forced", processes=True)
+    threads = _load(shards, tmp_path, monkeypatch, "threads", processes=False)
+    assert default.vok == forced.vok == threads.vok
+    assert default.removed == threads.removed
+
+def test_spawn_falls_back_to_threads(shards, tmp_path, monkeypatch):
+    # bei spawn würde der Worker "vokabeltrainer" neu importieren, was scheitert
+    monkeypatch.setattr(multiprocessing, "get_start_method", lambda *a, **k: "spawn")
+    loaded = _load(shards, tmp_path, monkeypatch, "spawn")
+    assert len(loaded.topics) == 3
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+QuestionDeck: jeder Durchgang fragt jede Karte genau einmal, an der Grenze
+zweier Durchgänge wiederholt sich nichts, und ein mit state()/restore()
+fortgesetztes Deck zieht genau weiter wie das ursprüngliche.
+
+Aufruf: python3 -m pytest -q test_question_deck.py
+"""
+
+from __future__ import annotations
+
+import pytest
+
+import headless
+
+en = headless.load_vocab_trainer()
+
+@pytest.mark.parametrize("n", [2, 3, 5, 17])
+def test_passes_cover_all_cards_without_boundary_repeat(n):
+    deck = en.QuestionDeck([f"w{i}" for i in range(n)], seed=1)
+    seq = [deck.next_card() for _ in range(8 * n)]
+    for start in range(0, len(seq), n):
+        assert sorted(seq[start:start + n]) == list(range(n))
+    assert all(a != b for a, b in zip(seq, seq[1:]))
+
+@pytest.mark.parametrize("n", [2, 3, 5])
+def test_restore_continues_same_sequence(n):
+    keys = [f"w{i}" for i in range(n)]
+    for seed in range(300):
+        for drawn in (0, n - 1, n, 2 * n + 1):
+            deck = en.QuestionDeck(keys, seed=seed)
+            for _ in range(drawn):
+                deck.next_card()
+            resumed = en.QuestionDeck.restore(keys, deck.state())
+            assert [resumed.next_card() for _ in range(3 * n)] == [deck.next_card() for _ in range(3 * n)]
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gemeinsamer Kern für Vokabel- und Mathetrainer: eine Sitzung, ein
+Bewertungsmodell und Aufgabentypen als Plugins.
+
+Ein Aufgabentyp liefert Aufgaben und bewertet Antworten:
+  next_task() -> Task                       nächste Aufgabe
+  grade(task, eingabe) -> (richtig, punkte, möglich, rückmeldung)
+  solution(task) -> str                     Lösungstext, erst bei Bedarf berechnet
+  review(task, richtig, sekunden)           Reihenfolge/Schwierigkeit nachführen
+dazu die Attribute name (Lernverlauf, Export der Antwortzeiten), label
+(Bericht der Antwortzeiten), thresholds (Notenskala, siehe grade_for) und
+timer_key ("card" oder "kind": wonach die Antwortzeiten gruppiert werden).
+
+Eingebaut sind "vokabeln" (VocabTasks im Vokabeltrainer) und "mathe"
+(MathTasks im Mathetrainer); weitere Typen kommen über register() dazu.
+Session übernimmt für alle Typen Punkte, Note, Frist, Antwortzeiten und
+Lernverlauf; ask(), shell_session(), die Mathe-GUI, der Quiz-Server und
+run_session() laufen darüber, console_answer() liest für beide Trainer die
+Eingaben, Instrumentation führt Zähler und Profil (--profile). Die
+Trainer-Skripte brauchen dieses Modul im selben Verzeichnis.
+
+Beispiel:
+    plugin = create("mathe", ops="+-")
+    score = run_session(plugin, n=10)
+"""
+
+from __future__ import annotations
+import os
+import sys
+import time
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from profiling import Profiler   # wird zur Laufzeit nur mit --profile geladen
+
+class Task(NamedTuple):
+    """Eine Aufgabe; Plugins dürfen auch einfache 5-Tupel in dieser Reihenfolge liefern."""
+    prompt: str      # Frage, wie sie angezeigt wird
+    answer: str      # eine richtige Eingabe (für simulierte Antworten)
+    card: str        # Schlüssel im Lernverlauf
+    kind: str        # Richtung bzw. Operator
+    data: Any        # nur für das Plugin selbst
+
+# ---------- Bewertung ----------
+
+Thresholds = Sequence[Tuple[float, Hashable]]
+
+def grade_for(pct: float, thresholds: Thresholds) -> Hashable:
+    """Note zur Prozentzahl: erster Eintrag (mindestprozent, note), den pct erreicht."""
+    for thresh, grade in thresholds:
+        if pct >= thresh:
+            return grade
+    return thresholds[-1][1]
+
+def percent(points: float, possible: float) -> float:
+    """punkte / möglich in Prozent, auf 0-100 begrenzt; 0 ohne mögliche Punkte."""
+    if possible <= 0:
+        return 0.0
+    return max(0.0, min(100.0, points / possible * 100.0))
+
+class Score:
+    """Punkte einer Runde; Prozent und Note siehe percent und grade_for."""
+    __slots__ = ("correct", "total", "points", "possible")
+
+    def __init__(self):
+        self.correct = 0
+        self.total = 0
+        self.points = 0.0
+        self.possible = 0.0
+
+    def add(self, ok: bool, earned: float, possible: float) -> None:
+        self.total += 1
+        self.correct += ok
+        self.points += earned
+        self.possible += possible
+
+    @property
+    def percent(self) -> float:
+        return percent(self.points, self.possible)
+
+    def grade(self, thresholds: Thresholds) -> Hashable:
+        return grade_for(self.percent, thresholds)
+
+# ---------- Plugins ----------
+
+PLUGINS: Dict[str, Callable[..., Any]] = {}
+
+def register(name: str, factory: Callable[..., Any]) -> None:
+    """Meldet einen Aufgabentyp an; factory(**optionen) liefert das Plugin."""
+    PLUGINS[name] = factory
+
+def create(name: str, **options: Any) -> Any:
+    try:
+        factory = PLUGINS[name]
+    except KeyError:
+        raise ValueError(f"Unbekannter Aufgabentyp {name!r}, bekannt: {', '.join(sorted(PLUGINS))}") from None
+    return factory(**options)
+
+# ---------- Trainer laden ----------
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+VOCAB_SCRIPT = "English(everyday words).py"
+MATH_SCRIPT = "Math(mental maths).py"
+
+def load_script(filename: str, module_name: str) -> ModuleType:
+    """Lädt ein Trainer-Skript (Leerzeichen im Namen) einmal als Modul `module_name`."""
+    mod = sys.modules.get(module_name)
+    if mod is None:
+        import importlib.util   # nur hier gebraucht; die Skripte selbst starten ohne
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(HERE, filename))
+        mod = importlib.util.module_from_spec(spec)
+        # unter seinem Namen registriert, damit pickle Funktionen daraus findet
+        # (Worker-Prozesse in load_vocab_multi)
+        sys.modules[module_name] = mod
+        try:
+            spec.loader.exec_module(mod)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+    return mod
+
+def load_vocab_trainer() -> ModuleType:
+    return load_script(VOCAB_SCRIPT, "vokabeltrainer")
+
+def load_math_trainer() -> ModuleType:
+    return load_script(MATH_SCRIPT, "mathetrainer")
+
+# ---------- Eingebaute Aufgabentypen ----------
+
+def _vocab(src: Optional[str] = None, loaded: Any = None, mode: int = 3, **options: Any) -> Any:
+    en = load_vocab_trainer()
+    if loaded is None:
+        loaded = en.load_vocab_cached(src or en.DEFAULT_URL)
+    return en.VocabTasks(loaded.vok, loaded.rev, loaded.answers, mode, **options)
+
+def _math(ops: Sequence[str] = "+-*/", pool: Any = None, seed: Optional[int] = None) -> Any:
+    ma = load_math_trainer()
+    if pool is None:
+        pool = ma.TaskPool([op for op in ops if op in ma.OPS], seed=seed)
+    return ma.MathTasks(pool)
+
+register("vokabeln", _vocab)
+register("mathe", _math)
+
+# ---------- Sitzung ----------
+
+class Session:
+    """
+    Eine Runde über einem Plugin, Schritt für Schritt: next_question() stellt
+    die nächste Frage (None = Runde vorbei, nach n Fragen oder der Frist in
+    Sekunden), answer() bewertet die Eingabe dazu und führt Punkte,
+    Antwortzeiten (timer) und Lernverlauf (store) nach.
+    """
+
+    def __init__(self, plugin: Any, n: Optional[int] = None, seconds: Optional[float] = None,
+                 store: Any = None, timer: Any = None):
+        self.plugin = plugin
+        self.left = n
+        self.deadline = time.monotonic() + seconds if seconds is not None else None
+        self.store = store
+        self.timer = timer
+        self.score = Score()
+        self.task: Optional[Tuple] = None
+
+    def remaining(self) -> Optional[float]:
+        return None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+
+    def next_question(self) -> Optional[str]:
+        if self.left is not None:
+            if self.left <= 0:
+                return None
+            self.left -= 1
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return None
+        self.task = self.plugin.next_task()
+        return self.task[0]
+
+    @property
+    def solution(self) -> str:
+        return self.plugin.solution(self.task)
+
+    def answer(self, text: str, seconds: float = 0.0) -> Tuple[bool, str]:
+        """Bewertet die Eingabe zur aktuellen Frage; (richtig, rückmeldung)."""
+        plugin, task = self.plugin, self.task
+        ok, earned, possible, message = plugin.grade(task, text)
+        ok = bool(ok)
+        self.score.add(ok, earned, possible)
+        plugin.review(task, ok, seconds)
+        _, _, card, kind, _ = task
+        if self.timer is not None:
+            self.timer.add(card if plugin.timer_key == "card" else kind, seconds)
+        if self.store is not None:
+            self.store.record(plugin.name, card, kind, ok, seconds)
+        return ok, message
+
+    @property
+    def grade(self) -> Hashable:
+        return self.score.grade(self.plugin.thresholds)
+
+    def summary(self) -> str:
+        return f"{self.score.correct}/{self.score.total} NOTE {self.grade}"
+
+    def finish(self) -> str:
+        """Lernverlauf schreiben; liefert den Bericht der Antwortzeiten (oder "")."""
+        if self.store is not None:
+            self.store.flush()
+        if self.timer is not None:
+            return self.timer.finish_round(self.plugin.name, self.plugin.label)
+        return ""
+
+def console_answer(prompt: str, solution: str, timeout: Optional[float] = None) -> Optional[str]:
+    """
+    Standard-Antwortquelle beider Trainer; headless.py liefert skriptbare Alternativen.
+    Mit timeout (Sekunden) wird höchstens so lange auf die Eingabe gewartet,
+    danach kommt None zurück. Umgeleitete Eingaben werden normal gelesen.
+    """
+    if timeout is None or not sys.stdin.isatty():
+        return input(prompt)
+    print(prompt, end="", flush=True)
+    deadline = time.monotonic() + max(0.0, timeout)
+    if sys.platform == "win32":
+        import msvcrt
+        buf = []
+        while True:
+            while msvcrt.kbhit():
+                ch = msvcrt.getwch()
+                if ch in "\r\n":
+                    print()
+                    return "".join(buf)
+                if ch == "\x03":
+                    raise KeyboardInterrupt
+                if ch in "\x00\xe0":
+                    msvcrt.getwch()   # Pfeil- und Funktionstasten
+                elif ch == "\b":
+                    if buf:
+                        buf.pop()
+                        print("\b \b", end="", flush=True)
+                else:
+                    buf.append(ch)
+                    print(ch, end="", flush=True)
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.02)
+    import select
+    ready, _, _ = select.select([sys.stdin], [], [], max(0.0, deadline - time.monotonic()))
+    if not ready:
+        return None
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
+def run_session(plugin: Any, n: Optional[int] = None, seconds: Optional[float] = None,
+                read_answer: Callable[[str, str], Optional[str]] = console_answer,
+                store: Any = None, timer: Any = None,
+                out: Callable[[str], Any] = print) -> Score:
+    """
+    Ganze Runde im Terminal oder headless (read_answer wie in headless.py).
+    Eine Antwort None beendet die Runde vorzeitig.
+    """
+    if timer is not None:
+        timer.clear()
+    session = Session(plugin, n, seconds, store, timer)
+    while True:
+        prompt = session.next_question()
+        if prompt is None:
+            break
+        t0 = time.perf_counter()
+        user = read_answer(prompt, session.task[1])
+        if user is None:
+            break
+        out(session.answer(user, time.perf_counter() - t0)[1])
+    score = session.score
+    out(f"\nErgebnis: {score.correct}/{score.total} ({score.percent:.1f} %), Note {session.grade}")
+    report = session.finish()
+    if report:
+        out(report)
+    return score
+
+# ---------- Zähler und Profiling ----------
+
+PROFILE_ENV = "LERNTRAINER_PROFILE"
+
+def profile_setting(args: Iterable[str]) -> Optional[str]:
+    """Wert von --profile[=VERZEICHNIS] aus args, sonst aus LERNTRAINER_PROFILE."""
+    setting = os.environ.get(PROFILE_ENV)
+    for arg in args:
+        if arg == "--profile":
+            setting = "1"
+        elif arg.startswith("--profile="):
+            setting = arg.split("=", 1)[1]
+    return setting
+
+class Instrumentation:
+    """
+    Zähler und Profil eines Trainers (siehe profiling.py). Die Zähler laufen
+    immer mit, werden daher nur pro Ladevorgang, Runde oder Ereignis erhöht
+    und nie pro Frage; extra() liefert weitere, ohnehin geführte Zählerstände.
+    profiling.py wird erst in start() geladen, wenn ein Profil gewünscht ist.
+    """
+
+    def __init__(self, trainer: str, extra: Optional[Callable[[], Dict[str, int]]] = None):
+        self.trainer = trainer
+        self.extra = extra
+        self.counts: Dict[str, int] = {}
+        self.profiler: Optional[Profiler] = None
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def counters(self) -> Dict[str, int]:
+        if self.extra is None:
+            return dict(self.counts)
+        return {**self.counts, **self.extra()}
+
+    def start(self, setting: Optional[str]) -> bool:
+        """Startet das Profil in der Phase "laden"; False, wenn nicht gewünscht oder profiling.py fehlt."""
+        if not setting or setting == "0":
+            return False
+        try:
+            import profiling
+        except ImportError:
+            print("profiling.py fehlt, es wird kein Profil aufgezeichnet.")
+            return False
+        self.profiler = profiling.start(self.trainer, setting)
+        self.phase("laden")
+        return True
+
+    def phase(self, name: str) -> None:
+        if self.profiler is not None:
+            self.profiler.enter(name)
+
+    def stop(self) -> None:
+        """Schreibt Profil und Zähler, falls ein Profil läuft."""
+        prof, self.profiler = self.profiler, None
+        if prof is not None:
+            out = prof.finish(self.counters())
+            print(f"Profil ({prof.report()}) gespeichert in {out}")